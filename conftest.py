@@ -1,10 +1,26 @@
 import pytest
 import os
+import sys
+from collections import Counter, defaultdict
 from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db import connection
 
+from kuranet.profiling import fingerprint
 
-def pytest_configure():
+# Statement shapes a single request may repeat before the test fails as an N+1
+N_PLUS_ONE_THRESHOLD = 5
+# Transaction bookkeeping repeats by design
+IGNORED_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+def pytest_configure(config):
     """Configure pytest for Django."""
+    config.addinivalue_line(
+        "markers",
+        "n_plus_one_threshold(n): let each statement shape repeat n times per request before failing",
+    )
     # Create static directory if it doesn't exist
     static_dir = os.path.join(settings.BASE_DIR, "static")
     if not os.path.exists(static_dir):
@@ -18,3 +34,89 @@ def pytest_configure():
 def enable_db_access_for_all_tests(db):
     """Enable database access for all tests."""
     pass
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches so cached state never leaks between tests."""
+    from users.authentication import revocations
+
+    cache.clear()
+    revocations.clear()
+
+
+def serializer_fields():
+    """The serializer fields being rendered by the calling code, outermost first."""
+    from rest_framework.serializers import Serializer
+
+    path = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == 'to_representation':
+            serializer, field = frame.f_locals.get('self'), frame.f_locals.get('field')
+            if isinstance(serializer, Serializer) and field is not None:
+                path.append(f"{type(serializer).__name__}.{field.field_name}")
+        frame = frame.f_back
+    return ' > '.join(reversed(path)) or None
+
+
+class NPlusOneDetector:
+    """
+    Fingerprints the SQL of every request made through the test clients and
+    collects the statement shapes that repeat more than ``threshold`` times
+    within one request, with the serializer fields that issued them.
+    """
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.request = None
+        self.violations = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.request is not None and not sql.startswith(IGNORED_STATEMENTS):
+            shape = fingerprint(sql)
+            self.counts[shape] += 1
+            self.fields[shape][serializer_fields()] += 1
+        return execute(sql, params, many, context)
+
+    def start(self, sender, environ=None, scope=None, **kwargs):
+        self.finish(sender)
+        if scope is not None:
+            self.request = f"{scope['method']} {scope['path']}"
+        else:
+            self.request = f"{environ['REQUEST_METHOD']} {environ['PATH_INFO']}"
+        self.counts = Counter()
+        self.fields = defaultdict(Counter)
+
+    def finish(self, sender=None, **kwargs):
+        if self.request is None:
+            return
+        for shape, count in self.counts.items():
+            if count > self.threshold:
+                self.violations.append((self.request, shape, count, self.fields[shape]))
+        self.request = None
+
+    def report(self):
+        lines = [f"Repeated queries (more than {self.threshold} of one shape in a request):"]
+        for request, shape, count, fields in self.violations:
+            lines.append(f"  {request}: {count}x {shape}")
+            for field, n in fields.most_common():
+                lines.append(f"    {n}x from {field or 'outside serializer fields'}")
+        return '\n'.join(lines)
+
+
+@pytest.fixture(autouse=True)
+def detect_n_plus_one(request, enable_db_access_for_all_tests):
+    """Fail the test when a request issues the same statement shape too often."""
+    marker = request.node.get_closest_marker('n_plus_one_threshold')
+    detector = NPlusOneDetector(marker.args[0] if marker else N_PLUS_ONE_THRESHOLD)
+    request_started.connect(detector.start)
+    request_finished.connect(detector.finish)
+    try:
+        with connection.execute_wrapper(detector):
+            yield detector
+    finally:
+        request_started.disconnect(detector.start)
+        request_finished.disconnect(detector.finish)
+    detector.finish()
+    if detector.violations:
+        pytest.fail(detector.report(), pytrace=False)
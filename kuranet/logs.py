@@ -0,0 +1,86 @@
+# kuranet/logs.py
+"""
+Off-thread JSON lines logging.
+
+``QueuedFileHandler`` is the only handler the loggers see: it puts records
+on an in-memory queue and returns, and a ``QueueListener`` thread formats
+them as JSON and writes them to a size-rotated file. Log calls on the
+request path therefore never wait on disk I/O.
+"""
+import atexit
+import copy
+import datetime
+import json
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_FIELDS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_TRACEBACKS = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the ``extra`` fields at the top level."""
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            # Records formatted directly rather than through QueuedFileHandler
+            entry['exception'] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class QueuedFileHandler(QueueHandler):
+    """Queues records for a listener thread writing JSON lines to a rotating file."""
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        target = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        target.setFormatter(JsonFormatter())
+        self.listener = QueueListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def prepare(self, record):
+        # QueueHandler.prepare folds the traceback into the message; keep it
+        # in its own field instead
+        exception = _TRACEBACKS.formatException(record.exc_info) if record.exc_info else None
+        stack = record.stack_info
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        record.exc_info = record.exc_text = record.stack_info = None
+        if exception:
+            record.exception = exception
+        if stack:
+            record.stack = stack
+        return record
+
+    def enqueue(self, record):
+        # Drop rather than block the caller when the writer falls behind
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def log_event(logger, event, rate=None, level=logging.INFO, **fields):
+    """
+    Log a structured ``event`` with ``fields`` for a ``rate`` fraction of
+    calls (``LOG_EVENT_SAMPLE_RATE`` by default), so hot paths stay cheap.
+    """
+    if rate is None:
+        from django.conf import settings
+        rate = settings.LOG_EVENT_SAMPLE_RATE
+    if rate < 1 and random.random() >= rate:
+        return
+    logger.log(level, event, extra={'event': event, 'sample_rate': rate, **fields})
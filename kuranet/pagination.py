@@ -0,0 +1,176 @@
+# kuranet/pagination.py
+"""
+Pagination classes shared by the polls and users APIs.
+
+The large listings (polls, votes, users) use keyset pagination: each page
+is an indexed range scan starting after the previous page's last row,
+so page N costs the same as page 1 and no COUNT(*) is ever run. Other
+listings keep page numbers but can skip the COUNT(*) with ``?count=false``.
+"""
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class OptionalCountPageNumberPagination(PageNumberPagination):
+    """
+    Page-number pagination whose total count can be turned off with
+    ``?count=false``. Without the count, one extra row is fetched to know
+    whether a next page exists.
+    """
+    count_query_param = 'count'
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() not in ('0', 'false', 'no')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.with_count = self.wants_count(request)
+        if self.with_count:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.page_number = max(int(request.query_params.get(self.page_query_param, 1)), 1)
+        except ValueError:
+            self.page_number = 1
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.with_count:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1
+        )
+
+    def get_previous_link(self):
+        if self.with_count:
+            return super().get_previous_link()
+        if self.page_number <= 1:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.page_query_param, self.page_number - 1
+        )
+
+    def get_paginated_response(self, data):
+        if self.with_count:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination over a unique ordering whose fields all sort the same
+    way, such as ``('voted_at', 'id')``. The cursor holds the whole key of
+    the last row, and the next page starts at
+    ``voted_at > t OR (voted_at = t AND id > i)``. Rows sharing the first
+    field are then a range scan too, with no OFFSET as in DRF's
+    CursorPagination. The ordering should be backed by an index on its
+    fields.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = [_flip(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(_after(ordering, self.load_position(self.cursor.position, queryset.model)))
+        rows = list(queryset[:self.page_size + 1])
+        more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = more, True
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, more
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.position_of(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.position_of(self.page[0])))
+
+    def position_of(self, instance):
+        """The encoded key of ``instance`` under the current ordering."""
+        values = [getattr(instance, field.lstrip('-')) for field in self.ordering]
+        return json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+
+    def load_position(self, position, model):
+        """The key decoded from ``position``, each value converted by its ``model`` field."""
+        try:
+            values = json.loads(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        key = []
+        for field, value in zip(self.ordering, values):
+            try:
+                value = model._meta.get_field(field.lstrip('-')).to_python(value)
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            key.append(value)
+        return key
+
+
+def _flip(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _after(ordering, values):
+    """Rows strictly after ``values`` in ``ordering``, as an OR of key prefixes."""
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        prefix = {other.lstrip('-'): value for other, value in zip(ordering[:i], values)}
+        condition |= Q(**prefix, **{f'{name}__{lookup}': values[i]})
+    # Redundant with the OR, but gives the planner a range on the leading field
+    first = ordering[0]
+    return Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]}) & condition
+
+
+class PollCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class VoteCursorPagination(KeysetPagination):
+    ordering = ('voted_at', 'id')
+
+
+class UserCursorPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
@@ -0,0 +1,157 @@
+# kuranet/profiling.py
+"""
+Lightweight per-request profiling, without DEBUG's ``connection.queries``.
+
+``QueryProfile`` is installed as a ``connection.execute_wrapper`` for the
+duration of a request and records time and count per SQL statement shape.
+``RequestMetrics`` keeps a rolling window of per-endpoint latency
+histograms, one slot per minute, read by the admin metrics endpoint.
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTS = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """The shape of a statement: literals and IN lists of any length collapse to ``?``."""
+    sql = _STRINGS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _LISTS.sub('(?)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryProfile:
+    """Execute wrapper that accumulates query counts and time by fingerprint."""
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = defaultdict(lambda: [0, 0.0])
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            entry = self.statements[fingerprint(sql)]
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def attach(self):
+        """Wrap every database connection of the current thread; close the returned stack to detach."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(self))
+        return stack
+
+    def duplicates(self):
+        """Statement shapes that ran more than once, with their counts."""
+        return {sql: count for sql, (count, _) in self.statements.items() if count > 1}
+
+    def top(self, limit=5):
+        """The ``limit`` statement shapes with the most total time."""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {'sql': sql, 'count': count, 'ms': round(seconds * 1000, 2)}
+            for sql, (count, seconds) in ranked[:limit]
+        ]
+
+
+class RequestMetrics:
+    """Process-wide rolling per-endpoint request metrics."""
+    def __init__(self, window=900):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # endpoint -> {minute: slot}
+            self._slots = defaultdict(dict)
+
+    def record(self, endpoint, seconds, db_seconds, queries, duplicates, now=None):
+        minute = int((now or time.time()) // 60)
+        ms = seconds * 1000
+        bucket = next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))
+        with self._lock:
+            slots = self._slots[endpoint]
+            slot = slots.get(minute)
+            if slot is None:
+                slot = slots[minute] = {
+                    'histogram': [0] * (len(BUCKETS_MS) + 1),
+                    'requests': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                    'db_ms': 0.0, 'queries': 0, 'max_queries': 0, 'duplicates': 0,
+                }
+                self._prune(slots, minute)
+            slot['histogram'][bucket] += 1
+            slot['requests'] += 1
+            slot['total_ms'] += ms
+            slot['max_ms'] = max(slot['max_ms'], ms)
+            slot['db_ms'] += db_seconds * 1000
+            slot['queries'] += queries
+            slot['max_queries'] = max(slot['max_queries'], queries)
+            slot['duplicates'] += duplicates
+
+    def _prune(self, slots, minute):
+        oldest = minute - self.window // 60
+        for stale in [key for key in slots if key < oldest]:
+            del slots[stale]
+
+    def snapshot(self, now=None):
+        oldest = int((now or time.time()) // 60) - self.window // 60
+        endpoints = {}
+        with self._lock:
+            for endpoint, slots in self._slots.items():
+                live = [slot for minute, slot in slots.items() if minute >= oldest]
+                if live:
+                    endpoints[endpoint] = self._summarize(live)
+        return {'window_seconds': self.window, 'endpoints': endpoints}
+
+    @staticmethod
+    def _summarize(slots):
+        histogram = [sum(counts) for counts in zip(*(slot['histogram'] for slot in slots))]
+        requests = sum(slot['requests'] for slot in slots)
+        max_ms = max(slot['max_ms'] for slot in slots)
+
+        def percentile(fraction):
+            # Upper bound of the bucket holding the percentile, capped by the observed max
+            target, seen = fraction * requests, 0
+            for bound, count in zip(BUCKETS_MS + (None,), histogram):
+                seen += count
+                if seen >= target:
+                    return min(bound, max_ms) if bound is not None else max_ms
+            return max_ms
+
+        return {
+            'requests': requests,
+            'mean_ms': round(sum(slot['total_ms'] for slot in slots) / requests, 2),
+            'p50_ms': round(percentile(0.5), 2),
+            'p95_ms': round(percentile(0.95), 2),
+            'p99_ms': round(percentile(0.99), 2),
+            'max_ms': round(max_ms, 2),
+            'mean_db_ms': round(sum(slot['db_ms'] for slot in slots) / requests, 2),
+            'mean_queries': round(sum(slot['queries'] for slot in slots) / requests, 2),
+            'max_queries': max(slot['max_queries'] for slot in slots),
+            'duplicate_queries': sum(slot['duplicates'] for slot in slots),
+            'histogram': [
+                {'le_ms': bound, 'count': count} for bound, count in zip(BUCKETS_MS + (None,), histogram)
+            ],
+        }
+
+
+metrics = RequestMetrics(window=settings.REQUEST_METRICS_WINDOW)
@@ -82,6 +82,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    "middleware.QueryTimingMiddleware",  # First, so it times the whole stack
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # Place early
@@ -212,6 +213,23 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing (users/hashers.py, users/hashing.py). Login and register
+# hash in a pool of PASSWORD_HASH_WORKERS processes (inline when 0) and shed
+# load with 503 once PASSWORD_HASH_QUEUE_DEPTH hashes are in flight.
+PASSWORD_HASHERS = [
+    "users.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", default=1_000_000, cast=int)
+PASSWORD_HASH_WORKERS = config("PASSWORD_HASH_WORKERS", default=0, cast=int)
+PASSWORD_HASH_QUEUE_DEPTH = config("PASSWORD_HASH_QUEUE_DEPTH", default=8, cast=int)
+AUTHENTICATION_BACKENDS = ["users.backends.PooledModelBackend"]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -234,6 +252,19 @@ USER_MODEL = "users.User"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 AUTH_USER_MODEL = "users.User"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+# JWT_STATELESS_AUTH builds request.user from token claims without loading
+# the User row; deactivation is honoured within JWT_REVOCATION_TTL seconds.
+# Session authentication is only needed for the browsable API.
+JWT_STATELESS_AUTH = config("JWT_STATELESS_AUTH", default=False, cast=bool)
+JWT_REVOCATION_TTL = config("JWT_REVOCATION_TTL", default=30, cast=int)
+API_SESSION_AUTH = config("API_SESSION_AUTH", default=DEBUG, cast=bool)
+API_AUTHENTICATION_CLASSES = [
+    "users.authentication.StatelessJWTAuthentication"
+    if JWT_STATELESS_AUTH
+    else "users.authentication.RoleClaimJWTAuthentication",
+]
+if API_SESSION_AUTH:
+    API_AUTHENTICATION_CLASSES.append("rest_framework.authentication.SessionAuthentication")
 REST_FRAMEWORK = {
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.URLPathVersioning",
     "DEFAULT_VERSION": "v1",
@@ -242,13 +273,46 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "rest_framework.authentication.SessionAuthentication",
-    ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_AUTHENTICATION_CLASSES": API_AUTHENTICATION_CLASSES,
+    "DEFAULT_PAGINATION_CLASS": "kuranet.pagination.OptionalCountPageNumberPagination",
     "PAGE_SIZE": 20,
 }
+# Cache used for rendered poll representations (polls/cache.py)
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "kuranet"),
+    }
+}
+POLL_CACHE_ALIAS = "default"
+# Web worker processes per host; gunicorn and uvicorn read the same variable.
+# With more than one, the poll cache needs a shared CACHE_BACKEND such as
+# django.core.cache.backends.redis.RedisCache and is off on LocMemCache.
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=1, cast=int)
+POLL_CACHE_TIMEOUT = config("POLL_CACHE_TIMEOUT", default=300, cast=int)
+# Embed role names in access tokens and trust them for permission checks.
+# Role changes then only take effect once the token is refreshed.
+JWT_ROLES_CLAIM = config("JWT_ROLES_CLAIM", default=False, cast=bool)
+
+# Buffered vote ingestion (polls/buffer.py). When enabled, votes are queued
+# and written in batches; the request waits up to VOTE_BUFFER_WAIT seconds
+# for its outcome before answering 202 Accepted.
+VOTE_BUFFER_ENABLED = config("VOTE_BUFFER_ENABLED", default=False, cast=bool)
+VOTE_BUFFER_BATCH_SIZE = config("VOTE_BUFFER_BATCH_SIZE", default=500, cast=int)
+VOTE_BUFFER_FLUSH_INTERVAL = config("VOTE_BUFFER_FLUSH_INTERVAL", default=0.05, cast=float)
+VOTE_BUFFER_WAIT = config("VOTE_BUFFER_WAIT", default=1.0, cast=float)
+# Live results stream (polls/events.py). Each connection receives at most
+# POLL_STREAM_MAX_RATE messages per second; deltas in between are merged.
+POLL_EVENT_BROKER = config("POLL_EVENT_BROKER", default="polls.events.LocalBroker")
+POLL_STREAM_MAX_RATE = config("POLL_STREAM_MAX_RATE", default=2.0, cast=float)
+POLL_STREAM_KEEPALIVE = config("POLL_STREAM_KEEPALIVE", default=15.0, cast=float)
+
+# Request instrumentation (middleware.QueryTimingMiddleware): requests slower
+# than REQUEST_SLOW_MS are logged with their top queries, and per-endpoint
+# metrics cover the last REQUEST_METRICS_WINDOW seconds
+REQUEST_SLOW_MS = config("REQUEST_SLOW_MS", default=500, cast=float)
+REQUEST_METRICS_WINDOW = config("REQUEST_METRICS_WINDOW", default=900, cast=int)
+
 # Swagger settings
 SWAGGER_SETTINGS = {
     "USE_SESSION_AUTH": False,
@@ -283,6 +347,8 @@ SIMPLE_JWT = {
     'UPDATE_LAST_LOGIN': True,
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
     'USER_AUTHENTICATION_RULE': 'rest_framework_simplejwt.authentication.default_user_authentication_rule',
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.RoleTokenObtainPairSerializer",
+    "TOKEN_USER_CLASS": "users.authentication.ClaimsUser",
 
 }
 SPECTACULAR_SETTINGS = {
@@ -340,22 +406,34 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@liwomasjid.co.ke')
 
 # Logging configuration
+# Logging: JSON lines written off the request thread to a rotating file.
+# LOG_LEVELS sets per-logger levels, e.g. "django.db.backends=DEBUG,polls=WARNING".
+LOG_FILE = config("LOG_FILE", default=os.path.join(BASE_DIR, "kuranet.log"))
+LOG_MAX_BYTES = config("LOG_MAX_BYTES", default=10 * 1024 * 1024, cast=int)
+LOG_BACKUP_COUNT = config("LOG_BACKUP_COUNT", default=5, cast=int)
+LOG_LEVEL = config("LOG_LEVEL", default="INFO")
+LOG_LEVELS = config("LOG_LEVELS", default="django=INFO")
+# Fraction of high-volume events (kuranet.logs.log_event) that are logged
+LOG_EVENT_SAMPLE_RATE = config("LOG_EVENT_SAMPLE_RATE", default=0.1, cast=float)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'handlers': {
-        'file': {
-            'level': 'DEBUG',
-            'class': 'logging.FileHandler',
-            'filename': os.path.join(BASE_DIR, 'debug.log'),
+        'queue': {
+            '()': 'kuranet.logs.QueuedFileHandler',
+            'filename': LOG_FILE,
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
         },
     },
+    'root': {
+        'handlers': ['queue'],
+        'level': LOG_LEVEL,
+    },
     'loggers': {
-        'django': {
-            'handlers': ['file'],
-            'level': 'DEBUG',
-            'propagate': True,
-        },
+        name.strip(): {'level': level.strip().upper()}
+        for name, level in (item.split('=', 1) for item in LOG_LEVELS.split(',') if '=' in item)
     },
 }
 
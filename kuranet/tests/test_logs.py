@@ -0,0 +1,42 @@
+# kuranet/tests/test_logs.py
+import atexit
+import json
+import logging
+import os
+import tempfile
+
+from kuranet.logs import JsonFormatter, QueuedFileHandler
+
+
+def test_json_formatter_puts_extra_fields_at_the_top_level():
+    record = logging.LogRecord("polls.views", logging.INFO, __file__, 1, "voted %s", ("once",), None)
+    record.event = "vote"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "voted once"
+    assert (entry["level"], entry["logger"], entry["event"]) == ("INFO", "polls.views", "vote")
+    assert entry["time"].endswith("+00:00")
+
+
+def test_queued_handler_keeps_the_traceback_in_its_own_field():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "kuranet.log")
+        handler = QueuedFileHandler(path)
+        logger = logging.getLogger("kuranet.tests.queued")
+        logger.addHandler(handler)
+        try:
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logger.exception("vote %s failed", 7, extra={"event": "vote.failed"})
+        finally:
+            logger.removeHandler(handler)
+            atexit.unregister(handler.listener.stop)
+            handler.listener.stop()
+            handler.listener.handlers[0].close()
+        with open(path) as log:
+            entry = json.loads(log.readline())
+
+    assert entry["message"] == "vote 7 failed"
+    assert entry["event"] == "vote.failed"
+    assert entry["exception"].startswith("Traceback")
+    assert "ValueError: boom" in entry["exception"]
@@ -0,0 +1,32 @@
+# kuranet/tests/test_n_plus_one.py
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from conftest import NPlusOneDetector
+from polls.models import Poll, PollOption, Vote
+from polls.serializers import VoteSerializer
+from users.models import User
+
+
+class NPlusOneDetectorTests(APITestCase):
+    def test_report_names_the_serializer_field_behind_repeated_queries(self):
+        owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        poll = Poll.objects.create(title="N+1", user=owner, closes_at=timezone.now() + timezone.timedelta(days=1))
+        option = PollOption.objects.create(poll=poll, text="A")
+        for i in range(4):
+            voter = User.objects.create_user(username=f"n{i}", password="testpass", email=f"n{i}@example.com")
+            Vote.objects.create(user=voter, option=option, poll=poll)
+
+        detector = NPlusOneDetector(threshold=3)
+        with connection.execute_wrapper(detector):
+            detector.start(None, environ={"REQUEST_METHOD": "GET", "PATH_INFO": "/votes/"})
+            VoteSerializer(Vote.objects.all(), many=True).data
+            detector.finish()
+            detector.start(None, environ={"REQUEST_METHOD": "GET", "PATH_INFO": "/votes/joined/"})
+            VoteSerializer(Vote.objects.select_related("user").prefetch_related("user__roles"), many=True).data
+            detector.finish()
+
+        self.assertEqual({request for request, *_ in detector.violations}, {"GET /votes/"})
+        report = detector.report()
+        self.assertIn("4x from VoteSerializer.user\n", report)
+        self.assertIn("4x from VoteSerializer.user > UserSerializer.roles", report)
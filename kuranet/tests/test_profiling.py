@@ -0,0 +1,58 @@
+# kuranet/tests/test_profiling.py
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from kuranet.profiling import fingerprint, metrics
+from polls.models import Poll, PollOption
+from users.models import Role, User
+
+
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        metrics.reset()
+        self.admin = User.objects.create_user(username="admin", password="testpass", email="admin@example.com")
+        self.admin.roles.add(Role.objects.get_or_create(name="admin")[0])
+        self.user = User.objects.create_user(username="plain", password="testpass", email="plain@example.com")
+        self.poll = Poll.objects.create(
+            title="Timed Poll",
+            user=self.admin,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        PollOption.objects.create(poll=self.poll, text="A")
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("poll-detail", kwargs={"pk": self.poll.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries"$')
+
+    def test_metrics_endpoint_is_admin_only_and_aggregates_by_endpoint(self):
+        for _ in range(3):
+            self.client.get(reverse("poll-list"))
+        url = reverse("request-metrics")
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        listed = response.data["endpoints"]["GET poll-list"]
+        self.assertEqual(listed["requests"], 3)
+        self.assertEqual(sum(bucket["count"] for bucket in listed["histogram"]), 3)
+        self.assertGreater(listed["mean_queries"], 0)
+        self.assertIn("password_hashing", response.data)
+
+    @override_settings(REQUEST_SLOW_MS=0)
+    def test_slow_requests_are_logged_with_top_queries(self):
+        with self.assertLogs("middleware", "WARNING") as logs:
+            self.client.get(reverse("poll-list"))
+        self.assertIn("Slow request GET /api/v1/polls/ (GET poll-list)", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    def test_fingerprint_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "name" = \'x\' LIMIT 21'),
+            fingerprint('SELECT * FROM "t"  WHERE "id" IN (%s) AND "name" = \'y\' LIMIT 5'),
+        )
@@ -14,6 +14,8 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 # Remove drf_yasg imports and replace with drf_spectacular
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from .views import RequestMetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     
@@ -25,6 +27,8 @@ urlpatterns = [
             path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
             path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
         ])),
+        # Admin-only request metrics of the serving process
+        path('metrics/requests/', RequestMetricsView.as_view(), name='request-metrics'),
     ])),
     
     # Documentation - updated to use drf_spectacular
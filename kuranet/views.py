@@ -0,0 +1,24 @@
+# kuranet/views.py
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from polls.permissions import IsAdmin
+from users import hashing
+
+from .profiling import metrics
+
+
+class RequestMetricsView(APIView):
+    """Rolling per-endpoint latency, query and password hashing metrics of this process."""
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        return Response({
+            **metrics.snapshot(),
+            'password_hashing': hashing.stats.snapshot(),
+        })
+
+    def delete(self, request):
+        metrics.reset()
+        return Response(status=204)
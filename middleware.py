@@ -1,5 +1,14 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 
+from kuranet.profiling import QueryProfile, metrics
+
+logger = logging.getLogger(__name__)
+
 class DisableCSRFCheckMiddleware(MiddlewareMixin):
     """
     Middleware to disable CSRF checks for specific views.
@@ -8,4 +17,68 @@ class DisableCSRFCheckMiddleware(MiddlewareMixin):
     def process_request(self, request):
         # Disable CSRF check for this request
         setattr(request, '_dont_enforce_csrf_checks', True)
-        return None
\ No newline at end of file
+        return None
+
+
+class QueryTimingMiddleware:
+    """
+    Records wall time, database time, query count and repeated statement
+    shapes of every request. They are sent back in a ``Server-Timing``
+    header, added to the per-endpoint metrics and logged when the request
+    takes longer than ``REQUEST_SLOW_MS``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile = QueryProfile()
+        started = time.perf_counter()
+        with profile.attach():
+            response = self.get_response(request)
+        self.finish(request, response, profile, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        # ORM calls of async views run in the request's sync thread, so the
+        # wrappers are installed there
+        profile = QueryProfile()
+        started = time.perf_counter()
+        wrappers = await sync_to_async(profile.attach)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+        self.finish(request, response, profile, time.perf_counter() - started)
+        return response
+
+    def finish(self, request, response, profile, seconds):
+        hashing = getattr(request, 'password_hash_seconds', 0.0)
+        timings = [
+            f'app;dur={seconds * 1000:.1f}',
+            f'db;dur={profile.seconds * 1000:.1f};desc="{profile.count} queries"',
+        ]
+        if hashing:
+            timings.append(f'hash;dur={hashing * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        match = request.resolver_match
+        endpoint = f"{request.method} {match.view_name if match else 'unresolved'}"
+        duplicates = profile.duplicates()
+        metrics.record(
+            endpoint, seconds, profile.seconds, profile.count,
+            sum(count - 1 for count in duplicates.values()),
+        )
+        if seconds * 1000 >= settings.REQUEST_SLOW_MS:
+            logger.warning(
+                "Slow request %s %s (%s): %.1f ms, %d queries in %.1f ms, top queries %s",
+                request.method, request.path, endpoint, seconds * 1000,
+                profile.count, profile.seconds * 1000, profile.top(),
+            )
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class PollsConfig(AppConfig):
+    name = "polls"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
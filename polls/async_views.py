@@ -0,0 +1,199 @@
+# polls/async_views.py
+"""
+Native async versions of the hot poll endpoints, for the ASGI application.
+
+These are plain Django async views rather than DRF viewsets (DRF views
+are sync-only), so under ASGI the reads run on the event loop with the
+async ORM and cache API. Casting a vote is the exception: DRF
+authentication is sync and the insert and counter updates need a
+transaction, which only sync code can open, so both run in one
+worker-thread hop. The views share authentication, caching, counters and
+buffering with polls/views.py and return the same payloads.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import buffer
+from . import cache as poll_cache
+from . import events
+from . import results
+from .counters import PollClosed, cast_vote
+from .models import Poll, PollOption, PollResultSnapshot
+from .serializers import PollSerializer
+from .views import PollViewSet
+
+
+def error_response(detail, status_code):
+    return JsonResponse({'error': detail}, status=status_code)
+
+
+def authenticate(request):
+    """Run the configured DRF authenticators; returns the user or raises APIException."""
+    drf_request = Request(
+        request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    return drf_request.user
+
+
+def parse_body(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+    return request.POST
+
+
+def authenticate_and_vote(request, option_id, poll_id):
+    """
+    The sync half of vote_create, run in a single worker-thread hop.
+    Returns the response, or the user when the vote goes to the buffer.
+    """
+    try:
+        user = authenticate(request)
+    except APIException as exc:
+        return JsonResponse({'detail': exc.detail}, status=exc.status_code)
+    if not user.is_authenticated:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    if option_id is None:
+        return error_response('Invalid option', status.HTTP_400_BAD_REQUEST)
+    if settings.VOTE_BUFFER_ENABLED:
+        return user
+
+    try:
+        cast_vote(user.pk, option_id, poll_id)
+    except PollOption.DoesNotExist:
+        return error_response('Invalid option', status.HTTP_400_BAD_REQUEST)
+    except PollClosed:
+        return error_response('This poll is closed', status.HTTP_400_BAD_REQUEST)
+    except IntegrityError:
+        return error_response('You have already voted in this poll', status.HTTP_400_BAD_REQUEST)
+    return JsonResponse({'status': 'Vote recorded'}, status=status.HTTP_201_CREATED)
+
+
+@csrf_exempt
+@require_POST
+async def vote_create(request, poll_id):
+    try:
+        option_id = int(parse_body(request).get('option_id'))
+    except (TypeError, ValueError):
+        option_id = None
+    outcome = await sync_to_async(authenticate_and_vote)(request, option_id, poll_id)
+    if isinstance(outcome, HttpResponse):
+        return outcome
+    return await vote_create_buffered(outcome, option_id, poll_id)
+
+
+async def vote_create_buffered(user, option_id, poll_id):
+    future = buffer.get_vote_buffer().submit(user.pk, option_id, poll_id)
+    try:
+        outcome = await asyncio.wait_for(asyncio.wrap_future(future), settings.VOTE_BUFFER_WAIT)
+    except asyncio.TimeoutError:
+        return JsonResponse({'status': 'Vote queued'}, status=status.HTTP_202_ACCEPTED)
+    if outcome == buffer.INVALID:
+        return error_response('Invalid option', status.HTTP_400_BAD_REQUEST)
+    if outcome == buffer.CLOSED:
+        return error_response('This poll is closed', status.HTTP_400_BAD_REQUEST)
+    if outcome == buffer.DUPLICATE:
+        return error_response('You have already voted in this poll', status.HTTP_400_BAD_REQUEST)
+    return JsonResponse({'status': 'Vote recorded'}, status=status.HTTP_201_CREATED)
+
+
+@require_GET
+async def poll_detail(request, pk):
+    version, body = await poll_cache.aget_cached(pk, 'detail')
+    if body is None:
+        try:
+            poll = await PollViewSet.get_poll_queryset(detail=True).aget(pk=pk)
+        except Poll.DoesNotExist:
+            return JsonResponse({'detail': 'No Poll matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
+        body = JSONRenderer().render(PollSerializer(poll).data)
+        await poll_cache.aset_cached(pk, version, 'detail', body)
+    return HttpResponse(body, content_type='application/json')
+
+
+@require_GET
+async def poll_results(request, poll_id):
+    version, payload = await poll_cache.aget_cached(poll_id, 'results')
+    if payload is None:
+        payload = await (
+            PollResultSnapshot.objects.filter(poll_id=poll_id).values_list('results', flat=True).afirst()
+        )
+        if payload is None:
+            rows = [row async for row in results.results_queryset([poll_id])]
+            payload = results.build_results(rows).get(poll_id)
+            if payload is None:
+                return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        await poll_cache.aset_cached(poll_id, version, 'results', payload)
+    return JsonResponse(payload)
+
+
+def sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+@require_GET
+async def poll_results_stream(request, poll_id):
+    """
+    Server-Sent Events stream of a poll's results: a ``snapshot`` event with
+    the current counts, then ``delta`` events with the votes added since
+    the previous message, at most POLL_STREAM_MAX_RATE per second.
+    """
+    if not isinstance(request, ASGIRequest):
+        # A WSGI server would buffer the endless stream instead of sending it
+        return JsonResponse(
+            {'detail': 'Results streaming is only available through kuranet.asgi.'},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        )
+    if not await Poll.objects.filter(pk=poll_id).aexists():
+        return JsonResponse({'detail': 'No Poll matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
+
+    async def stream():
+        # Subscribe before reading the counts so no vote falls in between;
+        # one that lands in both is counted twice until the client reconnects.
+        subscription = events.get_broker().subscribe(poll_id)
+        try:
+            counts = {
+                str(option_id): vote_count
+                async for option_id, vote_count in PollOption.objects
+                .filter(poll_id=poll_id).order_by('id').values_list('id', 'vote_count')
+            }
+            yield sse('snapshot', {'poll': poll_id, 'options': counts, 'total_votes': sum(counts.values())})
+            while True:
+                try:
+                    deltas = await subscription.get(timeout=settings.POLL_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                if not deltas:
+                    continue
+                yield sse('delta', {
+                    'poll': poll_id,
+                    'options': {str(option_id): delta for option_id, delta in deltas.items()},
+                    'total_votes': sum(deltas.values()),
+                })
+                # Votes arriving during the pause are merged into the next message
+                await asyncio.sleep(1 / settings.POLL_STREAM_MAX_RATE)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
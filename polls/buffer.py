@@ -0,0 +1,189 @@
+# polls/buffer.py
+"""
+Buffered vote ingestion.
+
+When ``VOTE_BUFFER_ENABLED`` is on, VoteViewSet.create hands votes to a
+process-wide VoteBuffer instead of inserting them itself. A background
+flusher drains the buffer every ``VOTE_BUFFER_FLUSH_INTERVAL`` seconds, or
+as soon as ``VOTE_BUFFER_BATCH_SIZE`` votes are waiting, and writes each
+batch with one ``bulk_create`` plus one counter UPDATE per touched option
+and poll. Every submitted vote gets a Future resolving to one of
+RECORDED, DUPLICATE, INVALID or CLOSED so the caller can report the
+outcome.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .counters import insert_votes, is_open
+from .models import PollOption, Vote
+
+logger = logging.getLogger(__name__)
+
+RECORDED = 'recorded'
+DUPLICATE = 'duplicate'
+INVALID = 'invalid'
+CLOSED = 'closed'
+
+PendingVote = namedtuple('PendingVote', ['user_id', 'option_id', 'poll_id'])
+
+
+class VoteBuffer:
+    def __init__(self, batch_size=500, flush_interval=0.5, autostart=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.autostart = autostart
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+
+    def submit(self, user_id, option_id, poll_id):
+        """Queue a vote and return a Future for its outcome."""
+        future = Future()
+        self._queue.put((PendingVote(user_id, option_id, poll_id), future))
+        if self.autostart:
+            self.start()
+        return future
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='vote-buffer-flusher', daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        """Stop the flusher thread after writing whatever is still queued."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """Write everything currently queued from the calling thread."""
+        outcomes = Counter()
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return outcomes
+            outcomes.update(self.write_batch(batch))
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                batch = self._drain(block=True)
+                if batch:
+                    self.write_batch(batch)
+        finally:
+            close_old_connections()
+
+    def _drain(self, block):
+        """Collect up to batch_size votes, waiting at most flush_interval."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def write_batch(self, batch):
+        """
+        Validate and insert a batch of (PendingVote, Future) pairs.
+
+        Option membership and existing votes are checked with one query
+        each; the rows left over are written with bulk_create. Returns a
+        Counter of outcomes.
+        """
+        try:
+            outcomes = self._write(batch)
+        except Exception as exc:
+            logger.exception("Failed to flush %d buffered votes", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return Counter()
+        for (_, future), outcome in zip(batch, outcomes):
+            future.set_result(outcome)
+        return Counter(outcomes)
+
+    def _write(self, batch):
+        votes = [vote for vote, _ in batch]
+        option_polls, open_polls = {}, set()
+        now = timezone.now()
+        for option_id, poll_id, poll_status, closes_at in (
+            PollOption.objects
+            .filter(pk__in={vote.option_id for vote in votes})
+            .values_list('pk', 'poll_id', 'poll__status', 'poll__closes_at')
+        ):
+            option_polls[option_id] = poll_id
+            if is_open(poll_status, closes_at, now):
+                open_polls.add(poll_id)
+        seen = set(
+            Vote.objects
+            .filter(
+                poll_id__in={vote.poll_id for vote in votes},
+                user_id__in={vote.user_id for vote in votes},
+            )
+            .values_list('user_id', 'poll_id')
+        )
+
+        outcomes = []
+        rows = []
+        for vote in votes:
+            if option_polls.get(vote.option_id) != vote.poll_id:
+                outcomes.append(INVALID)
+            elif vote.poll_id not in open_polls:
+                outcomes.append(CLOSED)
+            elif (vote.user_id, vote.poll_id) in seen:
+                outcomes.append(DUPLICATE)
+            else:
+                seen.add((vote.user_id, vote.poll_id))
+                rows.append(Vote(user_id=vote.user_id, option_id=vote.option_id, poll_id=vote.poll_id, voted_at=now))
+                outcomes.append(RECORDED)
+
+        if rows:
+            with transaction.atomic():
+                # Another process may write the same user's vote between the
+                # duplicate check and the insert; only rows that made it in
+                # count as recorded.
+                written = insert_votes(rows, batch_size=self.batch_size)
+            lost = {(row.user_id, row.poll_id) for row in rows} - written
+            if lost:
+                outcomes = [
+                    DUPLICATE if outcome == RECORDED and (vote.user_id, vote.poll_id) in lost else outcome
+                    for vote, outcome in zip(votes, outcomes)
+                ]
+        return outcomes
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_vote_buffer():
+    """Return the process-wide buffer configured from settings."""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = VoteBuffer(
+                batch_size=settings.VOTE_BUFFER_BATCH_SIZE,
+                flush_interval=settings.VOTE_BUFFER_FLUSH_INTERVAL,
+            )
+        return _buffer
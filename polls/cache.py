@@ -0,0 +1,105 @@
+# polls/cache.py
+"""
+Versioned cache for rendered poll representations.
+
+Every poll has a version number stored in the cache. Entries are keyed by
+poll id and that version, so invalidating a poll is a single ``incr`` and
+stale entries simply age out. Bumps are deferred until the surrounding
+transaction commits so a concurrent reader cannot cache pre-commit data
+under the new version.
+
+Invalidation only reaches the processes sharing the cache, so with several
+web workers (``WEB_CONCURRENCY``) the alias must be a shared backend such as
+Redis or Memcached. On a per-process backend such as LocMemCache the poll
+cache then stays off: every read misses and nothing is stored.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+# Backends whose entries other worker processes never see
+PROCESS_LOCAL_BACKENDS = {'django.core.cache.backends.locmem.LocMemCache'}
+
+
+def get_cache():
+    return caches[settings.POLL_CACHE_ALIAS]
+
+
+def is_enabled():
+    """False when several workers would each hold their own copy of the cache."""
+    backend = settings.CACHES[settings.POLL_CACHE_ALIAS]['BACKEND']
+    return settings.WEB_CONCURRENCY <= 1 or backend not in PROCESS_LOCAL_BACKENDS
+
+
+def version_key(poll_id):
+    return f'poll:{poll_id}:version'
+
+
+def entry_key(poll_id, version, variant):
+    return f'poll:{poll_id}:v{version}:{variant}'
+
+
+def get_poll_version(poll_id):
+    cache = get_cache()
+    version = cache.get(version_key(poll_id))
+    if version is None:
+        cache.add(version_key(poll_id), 1, timeout=None)
+        version = cache.get(version_key(poll_id), 1)
+    return version
+
+
+async def aget_poll_version(poll_id):
+    cache = get_cache()
+    version = await cache.aget(version_key(poll_id))
+    if version is None:
+        await cache.aadd(version_key(poll_id), 1, timeout=None)
+        version = await cache.aget(version_key(poll_id), 1)
+    return version
+
+
+def bump_poll_versions(poll_ids):
+    """Bump versions immediately; for code running outside a transaction."""
+    cache = get_cache()
+    for poll_id in poll_ids:
+        try:
+            cache.incr(version_key(poll_id))
+        except ValueError:
+            # Never read since the cache was last cleared; nothing to drop
+            # except entries written under version 1.
+            cache.add(version_key(poll_id), 2, timeout=None)
+
+
+def invalidate_polls(*poll_ids):
+    """Bump the version of each poll once the current transaction commits."""
+    poll_ids = set(poll_ids)
+    if poll_ids:
+        transaction.on_commit(lambda: bump_poll_versions(poll_ids))
+
+
+def get_cached(poll_id, variant):
+    """Return ``(version, payload)``; payload is None on a miss."""
+    if not is_enabled():
+        return None, None
+    version = get_poll_version(poll_id)
+    return version, get_cache().get(entry_key(poll_id, version, variant))
+
+
+def set_cached(poll_id, version, variant, payload):
+    if version is None:
+        return
+    get_cache().set(entry_key(poll_id, version, variant), payload, timeout=settings.POLL_CACHE_TIMEOUT)
+
+
+async def aget_cached(poll_id, variant):
+    """Async get_cached, for views running on the event loop."""
+    if not is_enabled():
+        return None, None
+    version = await aget_poll_version(poll_id)
+    return version, await get_cache().aget(entry_key(poll_id, version, variant))
+
+
+async def aset_cached(poll_id, version, variant, payload):
+    if version is None:
+        return
+    await get_cache().aset(entry_key(poll_id, version, variant), payload, timeout=settings.POLL_CACHE_TIMEOUT)
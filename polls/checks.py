@@ -0,0 +1,17 @@
+# polls/checks.py
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from . import cache as poll_cache
+
+
+@register(Tags.caches)
+def check_poll_cache(app_configs, **kwargs):
+    if poll_cache.is_enabled():
+        return []
+    return [Warning(
+        f"The poll cache is off: CACHES[{settings.POLL_CACHE_ALIAS!r}] is process-local "
+        f"but WEB_CONCURRENCY is {settings.WEB_CONCURRENCY}.",
+        hint='Point CACHE_BACKEND and CACHE_LOCATION at a cache all workers share, such as Redis or Memcached.',
+        id='polls.W001',
+    )]
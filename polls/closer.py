@@ -0,0 +1,41 @@
+# polls/closer.py
+"""
+Batch closing of polls whose deadline has passed.
+
+``Poll.save`` only closes a poll when something saves it, so expired polls
+are swept here instead: one indexed UPDATE per batch flips their status,
+their final results are frozen into result snapshots and put back in the
+cache.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from . import cache as poll_cache
+from .models import Poll
+from .results import get_results
+from .snapshots import build_snapshots
+
+# Statuses a poll can expire from; everything created through the API
+# starts as a draft.
+OPEN_STATUSES = ('active', 'draft')
+
+
+def close_expired_polls(now=None, batch_size=500):
+    """Close every open poll whose ``closes_at`` has passed; returns the closed ids."""
+    now = now or timezone.now()
+    closed = []
+    while True:
+        with transaction.atomic():
+            expired = Poll.objects.filter(status__in=OPEN_STATUSES, closes_at__lt=now)
+            poll_ids = list(
+                expired.select_for_update(skip_locked=True).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not poll_ids:
+                break
+            expired.filter(pk__in=poll_ids).update(status='closed', updated_at=now)
+            build_snapshots(poll_ids)
+            poll_cache.invalidate_polls(*poll_ids)
+        # Warm the cache once the new versions are in place
+        get_results(poll_ids)
+        closed.extend(poll_ids)
+    return closed
@@ -0,0 +1,84 @@
+# polls/conditional.py
+"""
+Conditional GET support for the poll endpoints.
+
+Validators come from ``Poll.updated_at`` and ``Poll.total_votes``, read by
+primary key on every request. A write in any worker therefore changes the
+ETag at once, and answering a revalidation costs that one query but never
+serializes the poll.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Poll
+
+
+def get_poll_validators(poll_id):
+    """Return ``(etag_base, last_modified)`` for a poll, or None if it does not exist."""
+    row = Poll.objects.filter(pk=poll_id).values_list('updated_at', 'total_votes').first()
+    if row is None:
+        return None
+    updated_at, total_votes = row
+    return f'{poll_id}-{updated_at.timestamp():.6f}-{total_votes}', updated_at
+
+
+class NotModified(Exception):
+    """Raised from ``initial()`` to short-circuit a view with a ready response."""
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Answers If-None-Match / If-Modified-Since with 304 for the actions in
+    ``conditional_actions``, and adds ETag and Last-Modified to 200s.
+
+    The check runs after authentication and permission checks but before
+    the action, so a 304 never builds a queryset or serializer. The ETag
+    also covers the request path, query string and negotiated media type,
+    so each page and representation revalidates separately.
+    """
+    conditional_actions = ()
+    conditional_poll_kwarg = 'poll_id'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators = None
+        if request.method in ('GET', 'HEAD') and self.action in self.conditional_actions:
+            self.conditional_validators = self.get_conditional_validators(request)
+        if self.conditional_validators is not None:
+            etag, last_modified = self.conditional_validators
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is not None:
+                raise NotModified(response)
+
+    def get_conditional_validators(self, request):
+        """Return ``(etag, last_modified)`` for this request, or None to skip."""
+        try:
+            poll_id = int(self.kwargs[self.conditional_poll_kwarg])
+        except ValueError:
+            return None
+        validators = get_poll_validators(poll_id)
+        if validators is None:
+            return None
+        etag_base, last_modified = validators
+        variant = f'{request.get_full_path()}|{request.accepted_media_type}'
+        digest = hashlib.md5(variant.encode(), usedforsecurity=False).hexdigest()[:12]
+        return f'"{etag_base}-{digest}"', int(last_modified.timestamp())
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'conditional_validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,150 @@
+# polls/counters.py
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .cache import invalidate_polls
+from .events import publish_votes
+from .models import Poll, PollOption, Vote
+
+
+def apply_vote_deltas(option_deltas, poll_deltas):
+    """
+    Apply vote counter deltas with one F() UPDATE per option and per poll.
+
+    Both arguments map a primary key to the number of votes to add (or
+    subtract). Must be called inside the transaction that wrote the votes.
+    """
+    for option_id, delta in option_deltas.items():
+        if delta:
+            PollOption.objects.filter(pk=option_id).update(vote_count=F('vote_count') + delta)
+    for poll_id, delta in poll_deltas.items():
+        if delta:
+            Poll.objects.filter(pk=poll_id).update(
+                total_votes=F('total_votes') + delta, updated_at=timezone.now()
+            )
+    invalidate_polls(*poll_deltas)
+
+
+def insert_votes(rows, batch_size=1000):
+    """
+    Insert Vote rows, skipping those that conflict with existing votes, and
+    bump the counters by the rows actually written.
+
+    The database drops conflicting rows silently, so the written ones are
+    read back by ``(user_id, poll_id, option_id, voted_at)``; every row
+    needs an explicit voted_at. Returns the set of ``(user_id, poll_id)``
+    written. Must be called inside a transaction.
+    """
+    if not rows:
+        return set()
+    Vote.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+    wanted = {(row.user_id, row.poll_id, row.option_id, row.voted_at) for row in rows}
+    written = wanted.intersection(
+        Vote.objects
+        .filter(user_id__in={row.user_id for row in rows}, poll_id__in={row.poll_id for row in rows})
+        .values_list('user_id', 'poll_id', 'option_id', 'voted_at')
+    )
+    apply_vote_deltas(
+        Counter(option_id for _, _, option_id, _ in written),
+        Counter(poll_id for _, poll_id, _, _ in written),
+    )
+    publish_votes((poll_id, option_id) for _, poll_id, option_id, _ in written)
+    return {(user_id, poll_id) for user_id, poll_id, _, _ in written}
+
+
+class PollClosed(Exception):
+    """The poll no longer accepts votes."""
+
+
+def is_open(status, closes_at, now=None):
+    """Whether a poll with this status and deadline accepts votes."""
+    return status != 'closed' and closes_at > (now or timezone.now())
+
+
+def record_vote(option_id, poll_id):
+    """
+    Bump the counters for a single vote.
+
+    Returns False, without touching the poll counter, when the option does
+    not belong to the poll, and raises PollClosed when the poll is closed
+    or past its deadline; callers should then roll back the vote.
+    """
+    updated = PollOption.objects.filter(pk=option_id, poll_id=poll_id).update(
+        vote_count=F('vote_count') + 1
+    )
+    if not updated:
+        return False
+    now = timezone.now()
+    # The poll UPDATE doubles as the closed check, so open polls pay nothing extra
+    updated = (
+        Poll.objects.filter(pk=poll_id, closes_at__gt=now).exclude(status='closed')
+        .update(total_votes=F('total_votes') + 1, updated_at=now)
+    )
+    if not updated:
+        raise PollClosed
+    invalidate_polls(poll_id)
+    publish_votes([(poll_id, option_id)])
+    return True
+
+
+def cast_vote(user_id, option_id, poll_id):
+    """
+    Insert a vote and bump its counters in one transaction.
+
+    Raises IntegrityError for a repeat vote, PollOption.DoesNotExist when
+    the option does not belong to the poll and PollClosed when the poll
+    no longer accepts votes.
+    """
+    # One INSERT; the (user, poll) unique constraint rejects repeat
+    # votes and the counter UPDATE doubles as the option/poll check.
+    with transaction.atomic():
+        Vote.objects.create(user_id=user_id, option_id=option_id, poll_id=poll_id)
+        if not record_vote(option_id, poll_id):
+            raise PollOption.DoesNotExist
+
+
+def recount_votes(poll_ids=None, commit=True):
+    """
+    Rebuild the stored counters from the Vote table.
+
+    Returns a list of ``(model_label, pk, stored, actual)`` tuples for every
+    counter that had drifted. When ``commit`` is False the drift is only
+    reported and nothing is written.
+    """
+    options = PollOption.objects.all()
+    polls = Poll.objects.all()
+    votes = Vote.objects.all()
+    if poll_ids is not None:
+        options = options.filter(poll_id__in=poll_ids)
+        polls = polls.filter(pk__in=poll_ids)
+        votes = votes.filter(poll_id__in=poll_ids)
+
+    option_actual = Counter(dict(
+        votes.values('option_id').annotate(n=Count('id')).values_list('option_id', 'n')
+    ))
+    poll_actual = Counter(dict(
+        votes.values('poll_id').annotate(n=Count('id')).values_list('poll_id', 'n')
+    ))
+
+    drift = []
+    for pk, stored in options.values_list('pk', 'vote_count'):
+        if stored != option_actual[pk]:
+            drift.append(('polls.PollOption', pk, stored, option_actual[pk]))
+    for pk, stored in polls.values_list('pk', 'total_votes'):
+        if stored != poll_actual[pk]:
+            drift.append(('polls.Poll', pk, stored, poll_actual[pk]))
+
+    if commit:
+        for label, pk, _, actual in drift:
+            if label == 'polls.PollOption':
+                PollOption.objects.filter(pk=pk).update(vote_count=actual)
+            else:
+                Poll.objects.filter(pk=pk).update(total_votes=actual, updated_at=timezone.now())
+        invalidate_polls(*options.filter(
+            pk__in=[pk for label, pk, _, _ in drift if label == 'polls.PollOption']
+        ).values_list('poll_id', flat=True))
+        invalidate_polls(*[pk for label, pk, _, _ in drift if label == 'polls.Poll'])
+    return drift
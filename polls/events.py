@@ -0,0 +1,122 @@
+# polls/events.py
+"""
+Publish/subscribe for live vote count deltas.
+
+Vote writers publish ``{option_id: delta}`` per poll once their
+transaction commits; the SSE results stream subscribes per poll. The
+broker is loaded from ``POLL_EVENT_BROKER``, so the in-process
+``LocalBroker`` can be replaced by one backed by an external pub/sub
+when votes and streams are served by different processes. A broker
+needs ``publish(poll_id, deltas)``, callable from any thread, and
+``subscribe(poll_id)`` returning an object with ``async get(timeout)``
+and ``close()``, called from the event loop.
+"""
+import asyncio
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """
+    Pending deltas for one listener. Deltas published between two reads
+    are merged, so a slow reader gets fewer, larger updates instead of
+    an ever-growing queue.
+    """
+    def __init__(self, broker, poll_id):
+        self.broker = broker
+        self.poll_id = poll_id
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._pending = Counter()
+        self._lock = threading.Lock()
+
+    def put(self, deltas):
+        with self._lock:
+            self._pending.update(deltas)
+        try:
+            self.loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # The listener's loop has shut down
+            self.close()
+
+    async def get(self, timeout=None):
+        """Wait for deltas and return everything merged since the last call."""
+        await asyncio.wait_for(self._ready.wait(), timeout)
+        self._ready.clear()
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        return pending
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """Fans deltas out to the subscribers of this process."""
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, poll_id):
+        subscription = Subscription(self, poll_id)
+        with self._lock:
+            self._subscribers[poll_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.poll_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.poll_id]
+
+    def publish(self, poll_id, deltas):
+        with self._lock:
+            subscribers = list(self._subscribers.get(poll_id, ()))
+        for subscription in subscribers:
+            subscription.put(deltas)
+
+    def subscriber_count(self, poll_id):
+        with self._lock:
+            return len(self._subscribers.get(poll_id, ()))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.POLL_EVENT_BROKER)()
+        return _broker
+
+
+def publish_votes(votes, defer=True):
+    """
+    Publish the count deltas for ``(poll_id, option_id)`` pairs.
+
+    With ``defer`` the deltas go out once the current transaction commits,
+    so listeners never see votes that get rolled back.
+    """
+    by_poll = defaultdict(Counter)
+    for poll_id, option_id in votes:
+        by_poll[poll_id][option_id] += 1
+    if not by_poll:
+        return
+
+    def send():
+        broker = get_broker()
+        for poll_id, deltas in by_poll.items():
+            broker.publish(poll_id, dict(deltas))
+
+    if defer:
+        transaction.on_commit(send)
+    else:
+        send()
@@ -0,0 +1,166 @@
+# polls/imports.py
+"""
+Bulk import of votes collected offline (kiosks, paper ballots).
+
+Ballots are ``(user_id, option_id, voted_at)`` records read from NDJSON or
+CSV as a stream, so input size is not bounded by memory. Each chunk is
+validated with one query per lookup (users, option -> poll, existing
+votes) and written with a single ``bulk_create``, with the vote counters
+bumped by one UPDATE per touched option and poll.
+"""
+import csv
+import datetime
+import json
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .counters import insert_votes
+from .models import PollOption, Vote
+from .snapshots import build_snapshots
+
+User = get_user_model()
+
+FORMATS = ('ndjson', 'csv')
+
+
+class ImportReport:
+    """Outcome counts of an import, plus the first ``max_errors`` rejected lines."""
+    def __init__(self, max_errors=100):
+        self.max_errors = max_errors
+        self.imported = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, line, reason, duplicate=False):
+        if duplicate:
+            self.duplicates += 1
+        else:
+            self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line, 'error': reason})
+
+    def as_dict(self):
+        return {
+            'imported': self.imported,
+            'duplicates': self.duplicates,
+            'rejected': self.rejected,
+            'errors': self.errors,
+        }
+
+
+def read_ndjson(lines):
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield number, record if isinstance(record, dict) else None
+
+
+def read_csv(lines):
+    """CSV with a header row naming at least user_id and option_id."""
+    reader = csv.DictReader(lines)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def parse_ballot(record, now):
+    """Return ``(user_id, option_id, voted_at)`` or raise ValueError."""
+    if record is None:
+        raise ValueError('Malformed record')
+    try:
+        user_id, option_id = int(record['user_id']), int(record['option_id'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('user_id and option_id must be integers')
+    voted_at = record.get('voted_at')
+    if voted_at in (None, ''):
+        return user_id, option_id, now
+    voted_at = parse_datetime(str(voted_at))
+    if voted_at is None:
+        raise ValueError('voted_at is not an ISO 8601 datetime')
+    if timezone.is_naive(voted_at):
+        voted_at = timezone.make_aware(voted_at, datetime.timezone.utc)
+    return user_id, option_id, voted_at
+
+
+def import_votes(lines, format='ndjson', chunk_size=5000, report=None):
+    """Import ballots from an iterable of text lines; returns an ImportReport."""
+    if format not in FORMATS:
+        raise ValueError(f'Unsupported format {format!r}')
+    report = report or ImportReport()
+    records = read_ndjson(lines) if format == 'ndjson' else read_csv(lines)
+    seen = set()
+    closed_polls = set()
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        import_chunk(chunk, report, seen, closed_polls)
+    if closed_polls:
+        # Late ballots change the final results of polls that already closed
+        build_snapshots(sorted(closed_polls))
+    return report
+
+
+def import_chunk(chunk, report, seen, closed_polls):
+    now = timezone.now()
+    ballots = []
+    for line, record in chunk:
+        try:
+            ballots.append((line, *parse_ballot(record, now)))
+        except ValueError as exc:
+            report.reject(line, str(exc))
+
+    options = {
+        option_id: (poll_id, status, closes_at)
+        for option_id, poll_id, status, closes_at in PollOption.objects
+        .filter(pk__in={option_id for _, _, option_id, _ in ballots})
+        .values_list('pk', 'poll_id', 'poll__status', 'poll__closes_at')
+    }
+    users = set(User.objects.filter(pk__in={user_id for _, user_id, _, _ in ballots}).values_list('pk', flat=True))
+    existing = set(
+        Vote.objects
+        .filter(
+            user_id__in=users,
+            poll_id__in={poll_id for poll_id, _, _ in options.values()},
+        )
+        .values_list('user_id', 'poll_id')
+    )
+
+    rows = []
+    for line, user_id, option_id, voted_at in ballots:
+        if user_id not in users:
+            report.reject(line, 'Unknown user')
+            continue
+        if option_id not in options:
+            report.reject(line, 'Unknown option')
+            continue
+        poll_id, status, closes_at = options[option_id]
+        if voted_at > closes_at:
+            report.reject(line, 'Cast after the poll closed')
+            continue
+        key = (user_id, poll_id)
+        if key in existing or key in seen:
+            report.reject(line, 'User has already voted in this poll', duplicate=True)
+            continue
+        seen.add(key)
+        if status == 'closed':
+            closed_polls.add(poll_id)
+        rows.append((line, Vote(user_id=user_id, option_id=option_id, poll_id=poll_id, voted_at=voted_at)))
+
+    if rows:
+        with transaction.atomic():
+            # Votes cast live while the import runs make their rows
+            # conflict; those are dropped by the insert and reported below
+            written = insert_votes([row for _, row in rows])
+        for line, row in rows:
+            if (row.user_id, row.poll_id) in written:
+                report.imported += 1
+            else:
+                report.reject(line, 'User has already voted in this poll', duplicate=True)
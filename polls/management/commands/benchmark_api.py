@@ -0,0 +1,262 @@
+# polls/management/commands/benchmark_api.py
+import json
+import os
+import platform
+import queue
+import random
+import statistics
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from polls.management.commands.seed import SEED_PASSWORD
+from polls.models import Poll, PollOption
+from users.models import User
+from users.serializers import RoleTokenObtainPairSerializer
+
+SCENARIOS = ('poll_list', 'poll_retrieve', 'vote_create', 'option_crud', 'login', 'users_list')
+
+# Metrics compared against a baseline, and whether higher is better
+COMPARED = {'throughput_rps': True, 'p50_ms': False, 'p95_ms': False, 'p99_ms': False}
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks the API hot paths in-process against a throwaway test database seeded with '
+        'the seed command, and reports throughput and p50/p95/p99 latency per scenario. '
+        '--output writes the results as JSON; --compare flags regressions against such a file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios', choices=SCENARIOS,
+            help='Scenario to run (may be repeated); defaults to all'
+        )
+        parser.add_argument('--requests', type=int, default=300, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads per scenario')
+        parser.add_argument('--login-requests', type=int, default=20,
+                            help='Timed requests for the login scenario, which is bound by password hashing')
+        parser.add_argument('--users', type=int, default=1000, help='Seeded users')
+        parser.add_argument('--polls', type=int, default=200, help='Seeded polls')
+        parser.add_argument('--votes-per-poll', type=int, default=100, help='Seeded votes per active or closed poll')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the dataset and the request mix')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', metavar='BASELINE', help='JSON results of an earlier run to compare against')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Relative slowdown tolerated before a metric is flagged (default 0.2 = 20%%)')
+
+    def handle(self, *args, **options):
+        scenarios = options['scenarios'] or list(SCENARIOS)
+        if options['users'] < options['requests'] + options['warmup'] and 'vote_create' in scenarios:
+            raise CommandError('vote_create needs one user per request: raise --users or lower --requests')
+        baseline = self.load_baseline(options['compare'])
+        self.rng = random.Random(options['seed'])
+
+        old_name = self.create_database()
+        try:
+            self.stdout.write('Seeding...')
+            call_command(
+                'seed', users=options['users'], polls=options['polls'],
+                votes_per_poll=options['votes_per_poll'], seed=options['seed'], stdout=StringIO(),
+            )
+            self.prepare()
+            results = {}
+            for name in scenarios:
+                count = options['login_requests'] if name == 'login' else options['requests']
+                results[name] = self.run_scenario(name, count, options['warmup'], options['concurrency'])
+                self.report(name, results[name])
+        finally:
+            connection.close()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        document = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'concurrency': options['concurrency'],
+                'requests': options['requests'],
+                'dataset': {key: options[key] for key in ('users', 'polls', 'votes_per_poll', 'seed')},
+            },
+            'scenarios': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(document, output, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if baseline is not None:
+            self.compare(baseline, document, options['tolerance'])
+
+    def create_database(self):
+        """Switch to a fresh test database; returns the original NAME for destroy_test_db."""
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST'].get('NAME'):
+            # A file rather than the default in-memory database, so every
+            # client thread sees the same data
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'kuranet_benchmark.sqlite3')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        return old_name
+
+    def load_baseline(self, path):
+        if not path:
+            return None
+        try:
+            with open(path) as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f'Cannot read baseline {path}: {exc}')
+
+    def prepare(self):
+        admin = User.objects.get(username='khalifah')
+        self.admin_auth = self.bearer(admin)
+        self.poll_ids = list(Poll.objects.values_list('pk', flat=True))
+        self.users = list(User.objects.filter(username__startswith='user').order_by('pk'))
+        self.vote_poll = Poll.objects.create(
+            user=admin, title='Benchmark votes', closes_at=timezone.now() + timezone.timedelta(days=1),
+            status='active',
+        )
+        self.vote_options = PollOption.objects.bulk_create(
+            PollOption(poll=self.vote_poll, text=f'Option {i}') for i in range(4)
+        )
+        self.vote_tokens = [self.bearer(user) for user in self.users]
+        self.next_voter = iter(range(len(self.users)))
+        self.voter_lock = threading.Lock()
+
+    @staticmethod
+    def bearer(user):
+        return f'Bearer {RoleTokenObtainPairSerializer.get_token(user).access_token}'
+
+    def run_scenario(self, name, count, warmup, concurrency):
+        """Run ``count`` timed requests on ``concurrency`` threads; returns the scenario's metrics."""
+        scenario = getattr(self, f'scenario_{name}')
+        jobs = queue.Queue()
+        for i in range(warmup + count):
+            jobs.put(i >= warmup)
+        latencies, codes, lock = [], {}, threading.Lock()
+
+        def worker():
+            # View exceptions come back as 500 responses rather than being re-raised
+            client = Client(raise_request_exception=False, HTTP_HOST='localhost')
+            try:
+                while True:
+                    try:
+                        timed = jobs.get_nowait()
+                    except queue.Empty:
+                        return
+                    started = time.perf_counter()
+                    try:
+                        status_code = scenario(client)
+                    except Exception:
+                        # Anything the client still raises is a failed request
+                        status_code = 500
+                    elapsed = time.perf_counter() - started
+                    if timed:
+                        with lock:
+                            latencies.append(elapsed)
+                            codes[status_code] = codes.get(status_code, 0) + 1
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        latencies.sort()
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        else:
+            cuts = (latencies or [0.0]) * 99
+        return {
+            'requests': len(latencies),
+            'errors': sum(n for code, n in codes.items() if code >= 400),
+            'status_codes': {str(code): n for code, n in sorted(codes.items())},
+            'seconds': round(wall, 3),
+            # Warmup requests share the wall clock, so count them too
+            'throughput_rps': round((warmup + count) / wall, 1),
+            'p50_ms': round(cuts[49] * 1000, 2),
+            'p95_ms': round(cuts[94] * 1000, 2),
+            'p99_ms': round(cuts[98] * 1000, 2),
+            'max_ms': round(max(latencies, default=0.0) * 1000, 2),
+        }
+
+    def scenario_poll_list(self, client):
+        return client.get(reverse('poll-list')).status_code
+
+    def scenario_poll_retrieve(self, client):
+        return client.get(reverse('poll-detail', kwargs={'pk': self.rng.choice(self.poll_ids)})).status_code
+
+    def scenario_vote_create(self, client):
+        with self.voter_lock:
+            voter = next(self.next_voter)
+        return client.post(
+            reverse('poll-votes', kwargs={'poll_id': self.vote_poll.pk}),
+            {'option_id': self.vote_options[voter % len(self.vote_options)].pk},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=self.vote_tokens[voter],
+        ).status_code
+
+    def scenario_option_crud(self, client):
+        """Create, read, rename and delete an option; the worst status code is reported."""
+        auth = {'HTTP_AUTHORIZATION': self.admin_auth}
+        poll_id = self.vote_poll.pk
+        created = client.post(
+            reverse('poll-options', kwargs={'poll_id': poll_id}), {'text': 'Benchmark option'},
+            content_type='application/json', **auth,
+        )
+        if created.status_code != 201:
+            return created.status_code
+        url = reverse('poll-option-detail', kwargs={'poll_id': poll_id, 'pk': created.json()['id']})
+        codes = [
+            client.get(url, **auth).status_code,
+            client.patch(url, {'text': 'Renamed'}, content_type='application/json', **auth).status_code,
+            client.delete(url, **auth).status_code,
+        ]
+        return max(codes)
+
+    def scenario_login(self, client):
+        user = self.rng.choice(self.users)
+        return client.post(
+            reverse('login'), {'username': user.username, 'password': SEED_PASSWORD},
+            content_type='application/json',
+        ).status_code
+
+    def scenario_users_list(self, client):
+        return client.get(reverse('user-list'), HTTP_AUTHORIZATION=self.admin_auth).status_code
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<14} {result['throughput_rps']:>8.1f} req/s  p50 {result['p50_ms']:>8.2f} ms  "
+            f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}"
+        )
+
+    def compare(self, baseline, document, tolerance):
+        regressions = []
+        for name, result in document['scenarios'].items():
+            before = baseline.get('scenarios', {}).get(name)
+            if before is None:
+                continue
+            for metric, higher_is_better in COMPARED.items():
+                old, new = before.get(metric), result[metric]
+                if not old:
+                    continue
+                change = (new - old) / old
+                if (-change if higher_is_better else change) > tolerance:
+                    regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.0%})")
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+            raise CommandError(f'{len(regressions)} metrics regressed beyond {tolerance:.0%}')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,106 @@
+# polls/management/commands/benchmark_pagination.py
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from kuranet.pagination import OptionalCountPageNumberPagination, VoteCursorPagination
+from polls.models import Poll, PollOption, Vote
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compares page-N latency of page-number and cursor pagination on a poll\'s votes (all writes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--votes', type=int, default=50000, help='Votes in the benchmark poll')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per page, best is reported')
+
+    def handle(self, *args, **options):
+        total = options['votes']
+        page_size = options['page_size']
+        repeat = options['repeat']
+        factory = APIRequestFactory()
+
+        try:
+            with transaction.atomic():
+                queryset = self.create_dataset(total)
+                last_page = max((total + page_size - 1) // page_size, 1)
+                pages = sorted({1, 10, 100, 1000, last_page} & set(range(1, last_page + 1)))
+
+                self.stdout.write(f"{'page':>8} {'offset+count ms':>16} {'cursor ms':>10}")
+                for page in pages:
+                    offset_ms = self.best_of(repeat, lambda: self.fetch_page_number(factory, queryset, page, page_size))
+                    cursor = self.cursor_for_page(factory, queryset, page, page_size)
+                    cursor_ms = self.best_of(repeat, lambda: self.fetch_cursor(factory, queryset, cursor, page_size))
+                    self.stdout.write(f"{page:>8} {offset_ms:>16.2f} {cursor_ms:>10.2f}")
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_dataset(self, total):
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            (User(username=f'bench_pager_{i}', email=f'bench_pager_{i}@example.com', password=password)
+             for i in range(total)),
+            batch_size=1000,
+        )
+        poll = Poll.objects.create(
+            user=users[0], title='Pagination benchmark', closes_at=timezone.now() + timedelta(days=1)
+        )
+        option = PollOption.objects.create(poll=poll, text='Option')
+        # Votes share timestamps in blocks, as when a batch import stamps a
+        # whole chunk alike, so the cursor has to page through ties
+        started = timezone.now() - timedelta(seconds=total)
+        Vote.objects.bulk_create(
+            (Vote(user=user, option=option, poll=poll, voted_at=started + timedelta(seconds=i // 1000))
+             for i, user in enumerate(users)),
+            batch_size=1000,
+        )
+        return Vote.objects.filter(poll=poll).order_by('voted_at', 'id')
+
+    def best_of(self, repeat, func):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def fetch_page_number(self, factory, queryset, page, page_size):
+        request = Request(factory.get('/', HTTP_HOST='localhost', data={'page': page, 'page_size': page_size}))
+        paginator = OptionalCountPageNumberPagination()
+        paginator.page_size_query_param = 'page_size'
+        return list(paginator.paginate_queryset(queryset, request))
+
+    def fetch_cursor(self, factory, queryset, cursor, page_size):
+        params = {'page_size': page_size}
+        if cursor:
+            params['cursor'] = cursor
+        paginator = VoteCursorPagination()
+        return list(paginator.paginate_queryset(queryset, Request(factory.get('/', HTTP_HOST='localhost', data=params))))
+
+    def cursor_for_page(self, factory, queryset, page, page_size):
+        """Encoded cursor pointing at the start of page N (not timed)."""
+        if page == 1:
+            return None
+        previous = queryset[(page - 1) * page_size - 1]
+        paginator = VoteCursorPagination()
+        paginator.paginate_queryset(queryset, Request(factory.get('/', HTTP_HOST='localhost', data={'page_size': page_size})))
+        encoded = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=paginator.position_of(previous)))
+        return parse_qs(urlsplit(encoded).query)['cursor'][0]
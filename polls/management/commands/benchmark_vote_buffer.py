@@ -0,0 +1,63 @@
+# polls/management/commands/benchmark_vote_buffer.py
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from polls.buffer import RECORDED, VoteBuffer
+from polls.models import Poll, PollOption
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measures buffered vote ingestion throughput at different batch sizes (all writes are rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--votes', type=int, default=2000, help='Votes to ingest per batch size')
+        parser.add_argument(
+            '--batch-sizes', default='1,10,100,500',
+            help='Comma-separated batch sizes to compare'
+        )
+
+    def handle(self, *args, **options):
+        total = options['votes']
+        batch_sizes = [int(size) for size in options['batch_sizes'].split(',')]
+
+        self.stdout.write(f"{'batch':>8} {'seconds':>10} {'votes/s':>12}")
+        try:
+            with transaction.atomic():
+                password = make_password(None)
+                users = User.objects.bulk_create(
+                    User(username=f'bench_voter_{i}', email=f'bench_voter_{i}@example.com', password=password)
+                    for i in range(total)
+                )
+                owner = users[0]
+                for batch_size in batch_sizes:
+                    poll = Poll.objects.create(
+                        user=owner,
+                        title=f'Benchmark poll ({batch_size})',
+                        closes_at=timezone.now() + timezone.timedelta(days=1),
+                    )
+                    poll_options = PollOption.objects.bulk_create(
+                        PollOption(poll=poll, text=f'Option {i}') for i in range(4)
+                    )
+
+                    vote_buffer = VoteBuffer(batch_size=batch_size, autostart=False)
+                    started = time.perf_counter()
+                    for i, user in enumerate(users):
+                        vote_buffer.submit(user.pk, poll_options[i % len(poll_options)].pk, poll.pk)
+                    outcomes = vote_buffer.flush()
+                    elapsed = time.perf_counter() - started
+
+                    self.stdout.write(f"{batch_size:>8} {elapsed:>10.3f} {outcomes[RECORDED] / elapsed:>12.0f}")
+                raise Rollback
+        except Rollback:
+            pass
@@ -0,0 +1,96 @@
+# polls/management/commands/benchmark_vote_load.py
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from django.utils import timezone
+
+from polls.models import Poll, PollOption
+from users.serializers import RoleTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Fires concurrent votes at a running server and reports throughput and latency. '
+        'Run it against gunicorn (WSGI) and uvicorn (ASGI) on the same database to compare; '
+        'see scripts/benchmark_asgi.sh. The fixture users and poll are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the server under test')
+        parser.add_argument('--votes', type=int, default=2000, help='Votes to cast, one per fixture user')
+        parser.add_argument('--concurrency', type=int, default=100, help='Requests in flight at once')
+        parser.add_argument(
+            '--endpoint', choices=['sync', 'async'], default='sync',
+            help='Vote through the DRF viewset or the native async view'
+        )
+
+    def handle(self, *args, **options):
+        total = options['votes']
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            User(username=f'load_voter_{i}', email=f'load_voter_{i}@example.com', password=password)
+            for i in range(total)
+        )
+        poll = Poll.objects.create(
+            user=users[0],
+            title='Load benchmark poll',
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        try:
+            poll_options = PollOption.objects.bulk_create(
+                PollOption(poll=poll, text=f'Option {i}') for i in range(4)
+            )
+            url_name = 'poll-votes-async' if options['endpoint'] == 'async' else 'poll-votes'
+            url = options['url'].rstrip('/') + reverse(url_name, kwargs={'poll_id': poll.pk})
+            jobs = [
+                (str(RoleTokenObtainPairSerializer.get_token(user).access_token), poll_options[i % 4].pk)
+                for i, user in enumerate(users)
+            ]
+            self.run_load(url, jobs, options['concurrency'])
+        finally:
+            poll.delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def run_load(self, url, jobs, concurrency):
+        local = threading.local()
+
+        def cast(job):
+            token, option_id = job
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+            started = time.perf_counter()
+            response = local.session.post(
+                url, json={'option_id': option_id}, headers={'Authorization': f'Bearer {token}'}
+            )
+            return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(cast, jobs))
+        except requests.ConnectionError as exc:
+            raise CommandError(f'Could not reach {url}: {exc}')
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(seconds for _, seconds in results)
+        codes = {}
+        for code, _ in results:
+            codes[code] = codes.get(code, 0) + 1
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+
+        self.stdout.write(f'{url}')
+        self.stdout.write(f'  requests     {len(results)} in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s)')
+        self.stdout.write(f'  status codes {dict(sorted(codes.items()))}')
+        self.stdout.write(
+            f'  latency ms   p50 {quantiles[49] * 1000:.1f}  p95 {quantiles[94] * 1000:.1f}  '
+            f'p99 {quantiles[98] * 1000:.1f}  max {latencies[-1] * 1000:.1f}'
+        )
@@ -0,0 +1,28 @@
+# polls/management/commands/close_expired_polls.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from polls.closer import close_expired_polls
+
+
+class Command(BaseCommand):
+    help = 'Closes polls past their deadline, freezing their timelines and warming their cached results'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--every', type=float, metavar='SECONDS',
+            help='Keep running and sweep at this interval instead of once'
+        )
+        parser.add_argument('--batch-size', type=int, default=500, help='Polls closed per transaction')
+
+    def handle(self, *args, **options):
+        while True:
+            closed = close_expired_polls(batch_size=options['batch_size'])
+            if closed or not options['every']:
+                self.stdout.write(self.style.SUCCESS(f"Closed {len(closed)} expired polls"))
+            if not options['every']:
+                break
+            close_old_connections()
+            time.sleep(options['every'])
@@ -0,0 +1,40 @@
+# polls/management/commands/import_votes.py
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.imports import FORMATS, import_votes
+
+
+class Command(BaseCommand):
+    help = 'Imports offline ballots (user_id, option_id, voted_at) from an NDJSON or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help='Input format; guessed from the file extension when omitted'
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Ballots validated and written per batch')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+        started = time.perf_counter()
+        try:
+            with open(path, newline='', encoding='utf-8') as lines:
+                report = import_votes(lines, format=format, chunk_size=options['chunk_size'])
+        except OSError as exc:
+            raise CommandError(exc)
+        elapsed = time.perf_counter() - started
+
+        for error in report.errors:
+            self.stdout.write(f"- line {error['line']}: {error['error']}")
+        total = report.imported + report.duplicates + report.rejected
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.imported} ballots ({report.duplicates} duplicates, {report.rejected} rejected) "
+            f"in {elapsed:.1f}s, {total / elapsed * 60 if elapsed else 0:.0f} ballots/minute"
+        ))
+        if options['verbosity'] > 1:
+            self.stdout.write(json.dumps(report.as_dict()))
@@ -0,0 +1,25 @@
+# polls/management/commands/rebuild_result_snapshots.py
+from django.core.management.base import BaseCommand
+
+from polls.models import Poll
+from polls.snapshots import build_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the result snapshots of closed polls from their votes'
+    chunk_size = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=int, action='append', dest='polls',
+            help='Only rebuild this poll id (may be repeated); defaults to every closed poll'
+        )
+
+    def handle(self, *args, **options):
+        poll_ids = options['polls']
+        if poll_ids is None:
+            poll_ids = list(Poll.objects.filter(status='closed').values_list('pk', flat=True))
+        written = 0
+        for start in range(0, len(poll_ids), self.chunk_size):
+            written += build_snapshots(poll_ids[start:start + self.chunk_size])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} result snapshots"))
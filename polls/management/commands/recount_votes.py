@@ -0,0 +1,33 @@
+# polls/management/commands/recount_votes.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from polls.counters import recount_votes
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the stored vote counters from the Vote table and reports any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--poll', type=int, action='append', dest='polls',
+            help='Only recount this poll id (may be repeated)'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report drift without writing the corrected counters'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = recount_votes(poll_ids=options['polls'], commit=not options['dry_run'])
+
+        for label, pk, stored, actual in drift:
+            self.stdout.write(f"- {label} {pk}: stored {stored}, actual {actual}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Vote counters are in sync"))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} counters have drifted"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(drift)} drifted counters"))
@@ -1,49 +1,107 @@
 # polls/management/commands/seed.py
 import random
-from django.utils import timezone
-from datetime import datetime, timedelta
-from django.core.management.base import BaseCommand
+import time
+from collections import Counter
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
 from users.models import Role
 from polls.models import Poll, PollOption, Vote
 
 User = get_user_model()
 
+SEED_PASSWORD = 'password123'
+
+POLL_TEMPLATES = [
+    {
+        "title": "Favorite Programming Language",
+        "description": "Which programming language do you enjoy working with the most?",
+        "options": ["Python", "JavaScript", "Java", "C#", "Go", "Rust"]
+    },
+    {
+        "title": "Best Web Framework",
+        "description": "What's your preferred backend framework?",
+        "options": ["Django", "Flask", "Spring Boot", "Express", "ASP.NET Core", "Laravel"]
+    },
+    {
+        "title": "Preferred Cloud Provider",
+        "description": "Which cloud platform do you use most?",
+        "options": ["AWS", "Azure", "Google Cloud", "DigitalOcean", "Heroku", "Linode"]
+    },
+    {
+        "title": "Favorite Database",
+        "description": "Which database technology do you prefer?",
+        "options": ["PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", "Cassandra"]
+    },
+    {
+        "title": "Top JavaScript Framework",
+        "description": "What's your go-to frontend framework?",
+        "options": ["React", "Vue", "Angular", "Svelte", "Next.js", "SolidJS"]
+    },
+    {
+        "title": "Preferred Operating System",
+        "description": "Which OS do you use for development?",
+        "options": ["Windows", "macOS", "Linux", "BSD"]
+    },
+    {
+        "title": "Most Important Tech Skill",
+        "description": "What skill is most valuable for developers?",
+        "options": ["Problem Solving", "Algorithms", "System Design", "Communication", "Testing"]
+    }
+]
+
+CREATOR_PROFILES = [
+    {'first_name': 'Emma', 'last_name': 'Thompson', 'username': 'emma_creator'},
+    {'first_name': 'James', 'last_name': 'Wilson', 'username': 'james_creator'},
+    {'first_name': 'Sophia', 'last_name': 'Chen', 'username': 'sophia_creator'},
+    {'first_name': 'Michael', 'last_name': 'Rodriguez', 'username': 'michael_creator'},
+    {'first_name': 'Olivia', 'last_name': 'Patel', 'username': 'olivia_creator'}
+]
+
+
 class Command(BaseCommand):
-    help = 'Seeds the database with realistic polling data'
-    
+    help = (
+        'Seeds the database with realistic polling data. Every row is written with chunked '
+        'bulk_create, so production-sized datasets take minutes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Regular users to create')
+        parser.add_argument('--polls', type=int, default=10, help='Polls to create')
+        parser.add_argument(
+            '--votes-per-poll', type=int,
+            help='Votes cast in each active or closed poll (default: 50-90%% of the users)'
+        )
+        parser.add_argument('--seed', type=int, help='Random seed, for reproducible datasets')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per bulk INSERT transaction')
+
     def handle(self, *args, **options):
+        if options['votes_per_poll'] is not None and options['votes_per_poll'] > options['users']:
+            raise CommandError("--votes-per-poll cannot exceed --users: each user votes once per poll")
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        started = time.perf_counter()
+
         self.stdout.write("Deleting old data...")
-        models = [Vote, PollOption, Poll, Role]
-        
-        # Preserve superusers (like admin)
-        # User.objects.filter(is_superuser=False).delete()
-            
-        # Clear all existing data (adjust order if there are foreign key constraints)
-        Vote.objects.all().delete()
-        PollOption.objects.all().delete()
-        Poll.objects.all().delete()
-        User.objects.all().delete()  # This must come before Role deletion if Role has FK to User
-        Role.objects.all().delete()
-        for model in models:
+        # Children first, so each DELETE is a single statement without cascades
+        for model in [Vote, PollOption, Poll, User.roles.through, User, Role]:
             model.objects.all().delete()
-        
+
         self.stdout.write("Creating roles...")
-        roles_data = [
-            {'name': 'admin', 'description': 'Administrator role'},
-            {'name': 'creator', 'description': 'Content creator role'},
-            {'name': 'user', 'description': 'Regular user role'}
-        ]
-        
-        for role_data in roles_data:
-            Role.objects.create(**role_data)
-            
-        admin_role = Role.objects.get(name='admin')
-        creator_role = Role.objects.get(name='creator')
-        user_role = Role.objects.get(name='user')
-        
+        roles = {
+            role.name: role for role in Role.objects.bulk_create([
+                Role(name='admin', description='Administrator role'),
+                Role(name='creator', description='Content creator role'),
+                Role(name='user', description='Regular user role'),
+            ])
+        }
+
         self.stdout.write("Creating users...")
-        # Create admin
         admin = User.objects.create_superuser(
             username='khalifah',
             email='admin@khalfanathman.dev',
@@ -51,155 +109,112 @@ class Command(BaseCommand):
             first_name='Admin',
             last_name='User'
         )
-        admin.roles.add(admin_role, creator_role)
-        
-        # Create creators
-        creators = []
-        creator_profiles = [
-            {'first_name': 'Emma', 'last_name': 'Thompson', 'username': 'emma_creator'},
-            {'first_name': 'James', 'last_name': 'Wilson', 'username': 'james_creator'},
-            {'first_name': 'Sophia', 'last_name': 'Chen', 'username': 'sophia_creator'},
-            {'first_name': 'Michael', 'last_name': 'Rodriguez', 'username': 'michael_creator'},
-            {'first_name': 'Olivia', 'last_name': 'Patel', 'username': 'olivia_creator'}
-        ]
-        
-        for profile in creator_profiles:
-            user = User.objects.create_user(
-                **profile,
-                email=f"{profile['username']}@example.com",
-                password=f"{profile['username']}123"
-            )
-            user.roles.add(creator_role)
-            creators.append(user)
-        
-        # Create regular users
-        users = []
-        for i in range(1, 51):  # 50 regular users
-            user = User.objects.create_user(
-                username=f'user{i}',
-                email=f'user{i}@example.com',
-                password=f'user{i}123',
-                first_name=f'User{i}',
-                last_name='Test'
-            )
-            user.roles.add(user_role)
-            users.append(user)
-        
-        self.stdout.write("Creating polls...")
-        poll_templates = [
-            {
-                "title": "Favorite Programming Language",
-                "description": "Which programming language do you enjoy working with the most?",
-                "options": ["Python", "JavaScript", "Java", "C#", "Go", "Rust"]
-            },
-            {
-                "title": "Best Web Framework",
-                "description": "What's your preferred backend framework?",
-                "options": ["Django", "Flask", "Spring Boot", "Express", "ASP.NET Core", "Laravel"]
-            },
-            {
-                "title": "Preferred Cloud Provider",
-                "description": "Which cloud platform do you use most?",
-                "options": ["AWS", "Azure", "Google Cloud", "DigitalOcean", "Heroku", "Linode"]
-            },
-            {
-                "title": "Favorite Database",
-                "description": "Which database technology do you prefer?",
-                "options": ["PostgreSQL", "MySQL", "MongoDB", "Redis", "SQLite", "Cassandra"]
-            },
-            {
-                "title": "Top JavaScript Framework",
-                "description": "What's your go-to frontend framework?",
-                "options": ["React", "Vue", "Angular", "Svelte", "Next.js", "SolidJS"]
-            },
-            {
-                "title": "Preferred Operating System",
-                "description": "Which OS do you use for development?",
-                "options": ["Windows", "macOS", "Linux", "BSD"]
-            },
-            {
-                "title": "Most Important Tech Skill",
-                "description": "What skill is most valuable for developers?",
-                "options": ["Problem Solving", "Algorithms", "System Design", "Communication", "Testing"]
-            }
-        ]
-        
-        polls = []
-        for template in poll_templates:
-            creator = random.choice(creators)
-            created_at = timezone.now() - timedelta(days=random.randint(1, 30))
-            closes_at = created_at + timedelta(days=random.randint(3, 60))
-            
-            poll = Poll.objects.create(
-                user=creator,
-                title=template["title"],
-                description=template["description"],
-                created_at=created_at,
-                closes_at=closes_at,
-                status=random.choice(['active', 'active', 'active', 'draft', 'closed'])
-            )
-            polls.append(poll)
-            
-            # Create options
-            for option_text in template["options"]:
-                PollOption.objects.create(
-                    poll=poll,
-                    text=option_text
-                )
-        
-        self.stdout.write("Creating votes...")
-        # Create votes for active and closed polls
-        votable_polls = Poll.objects.filter(status__in=['active', 'closed'])
-        
-        for poll in votable_polls:
-            options = list(poll.options.all())
-            time_diff = (poll.closes_at - poll.created_at).total_seconds()
-    
-            # Skip if closes_at is before created_at
-            if time_diff <= 0:
-                continue
-            # Determine number of voters (50-90% of users)
-            num_voters = random.randint(
-                int(len(users) * 0.5), 
-                int(len(users) * 0.9)
-            )
-            voters = random.sample(users, k=num_voters)
-            
-            for voter in voters:
-                # Each voter votes once per poll
-                option = random.choice(options)
-                vote_date = poll.created_at + timedelta(
-                    seconds=random.randint(0, int((poll.closes_at - poll.created_at).total_seconds()))
-                )
-                Vote.objects.create(
-                    user=voter,
-                    option=option,
-                    voted_at=vote_date
-                )
-        
-        # Create some draft polls
-        for i in range(3):
-            creator = random.choice(creators)
-            created_at = timezone.now() - timedelta(days=random.randint(1, 30))
-            closes_at = created_at + timedelta(days=random.randint(3, 60)) 
-            
-            poll = Poll.objects.create(
-                user=creator,
-                title=f"Draft Poll {i+1}",
-                description="This is a draft poll that hasn't been published yet",
-                created_at=created_at,
-                closes_at=closes_at,
-                status='draft'
-            )
-            for j in range(3, 6):
-                PollOption.objects.create(
-                    poll=poll,
-                    text=f"Option {j}"
-                )
-        
-        self.stdout.write(self.style.SUCCESS("Successfully seeded database with:"))
-        self.stdout.write(f"- {User.objects.count()} users")
+        admin.roles.add(roles['admin'], roles['creator'])
+
+        # One hash shared by every seeded account instead of one per user
+        password = make_password(SEED_PASSWORD)
+        creator_ids = self.create_users(
+            (User(**profile, email=f"{profile['username']}@example.com", password=password)
+             for profile in CREATOR_PROFILES),
+            roles['creator'],
+        )
+        user_ids = self.create_users(
+            (User(username=f'user{i}', email=f'user{i}@example.com', password=password,
+                  first_name=f'User{i}', last_name='Test')
+             for i in range(1, options['users'] + 1)),
+            roles['user'],
+        )
+
+        self.stdout.write("Creating polls and votes...")
+        for start in range(0, options['polls'], self.chunk_size):
+            count = min(self.chunk_size, options['polls'] - start)
+            self.create_polls(start, count, creator_ids, user_ids, options['votes_per_poll'])
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Successfully seeded database in {elapsed:.1f}s with:"))
+        self.stdout.write(f"- {User.objects.count()} users (password '{SEED_PASSWORD}', admin 'admin123')")
         self.stdout.write(f"- {Role.objects.count()} roles")
         self.stdout.write(f"- {Poll.objects.count()} polls")
         self.stdout.write(f"- {PollOption.objects.count()} poll options")
-        self.stdout.write(f"- {Vote.objects.count()} votes")
\ No newline at end of file
+        self.stdout.write(f"- {Vote.objects.count()} votes")
+
+    def create_users(self, users, role):
+        """Insert users and their role links in chunks; returns the new ids."""
+        user_ids = []
+        users = iter(users)
+        while True:
+            chunk = [user for _, user in zip(range(self.chunk_size), users)]
+            if not chunk:
+                return user_ids
+            with transaction.atomic():
+                created = User.objects.bulk_create(chunk)
+                User.roles.through.objects.bulk_create(
+                    User.roles.through(user_id=user.pk, role_id=role.pk) for user in created
+                )
+            user_ids.extend(user.pk for user in created)
+
+    def create_polls(self, start, count, creator_ids, user_ids, votes_per_poll):
+        rng = self.rng
+        now = timezone.now()
+        plans = []
+        for i in range(start, start + count):
+            template = POLL_TEMPLATES[i % len(POLL_TEMPLATES)]
+            created_at = now - timedelta(days=rng.randint(1, 30), seconds=rng.randint(0, 86399))
+            closes_at = created_at + timedelta(days=rng.randint(3, 60))
+            status = rng.choice(['active', 'active', 'active', 'draft', 'closed'])
+            voters = []
+            if status != 'draft':
+                voters = rng.sample(
+                    user_ids,
+                    votes_per_poll if votes_per_poll is not None
+                    else rng.randint(int(len(user_ids) * 0.5), int(len(user_ids) * 0.9)),
+                )
+            choices = [rng.randrange(len(template['options'])) for _ in voters]
+            plans.append((template, created_at, closes_at, status, voters, choices))
+
+        with transaction.atomic():
+            polls = Poll.objects.bulk_create([
+                Poll(
+                    user_id=rng.choice(creator_ids),
+                    title=template['title'] if i < len(POLL_TEMPLATES) else f"{template['title']} #{i + 1}",
+                    description=template['description'],
+                    closes_at=closes_at,
+                    status=status,
+                    total_votes=len(voters),
+                )
+                for i, (template, _, closes_at, status, voters, _) in enumerate(plans, start=start)
+            ])
+            # created_at is auto_now_add, so backdate it after the insert
+            for poll, plan in zip(polls, plans):
+                poll.created_at = plan[1]
+            Poll.objects.bulk_update(polls, ['created_at'], batch_size=500)
+
+            # Vote choices are drawn up front, so the counters are written final
+            options = []
+            for poll, (template, _, _, _, _, choices) in zip(polls, plans):
+                counts = Counter(choices)
+                options.append([
+                    PollOption(poll=poll, text=text, vote_count=counts[index])
+                    for index, text in enumerate(template['options'])
+                ])
+            PollOption.objects.bulk_create([option for poll_options in options for option in poll_options])
+
+        votes = []
+        for poll, poll_options, (_, created_at, closes_at, _, voters, choices) in zip(polls, options, plans):
+            span = int((min(closes_at, now) - created_at).total_seconds())
+            for user_id, index in zip(voters, choices):
+                votes.append(Vote(
+                    user_id=user_id,
+                    option_id=poll_options[index].pk,
+                    poll_id=poll.pk,
+                    voted_at=created_at + timedelta(seconds=rng.randint(0, span)),
+                ))
+                if len(votes) >= self.chunk_size:
+                    self.write_votes(votes)
+                    votes = []
+        self.write_votes(votes)
+
+    def write_votes(self, votes):
+        if votes:
+            with transaction.atomic():
+                Vote.objects.bulk_create(votes)
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:13
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_vote_counters(apps, schema_editor):
+    Poll = apps.get_model("polls", "Poll")
+    PollOption = apps.get_model("polls", "PollOption")
+    Vote = apps.get_model("polls", "Vote")
+
+    def count_by(field):
+        return Coalesce(
+            Subquery(
+                Vote.objects.filter(**{field: OuterRef("pk")})
+                .values(field)
+                .annotate(n=Count("id"))
+                .values("n")[:1]
+            ),
+            0,
+        )
+
+    PollOption.objects.update(vote_count=count_by("option"))
+    Poll.objects.update(total_votes=count_by("poll"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0003_rename_expires_at_poll_closes_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="total_votes",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="polloption",
+            name="vote_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0004_poll_total_votes_polloption_vote_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="poll",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
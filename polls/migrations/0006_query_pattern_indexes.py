@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0005_poll_updated_at"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(fields=["created_at", "id"], name="poll_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="poll",
+            index=models.Index(
+                fields=["status", "closes_at"], name="poll_status_closes_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(fields=["poll", "option"], name="vote_poll_option_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="vote",
+            index=models.Index(
+                fields=["poll", "voted_at", "id"], name="vote_poll_voted_idx"
+            ),
+        ),
+    ]
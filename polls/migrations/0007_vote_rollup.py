@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0006_query_pattern_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoteRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("votes", models.PositiveIntegerField()),
+                (
+                    "option",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="polls.polloption",
+                    ),
+                ),
+                (
+                    "poll",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="vote_rollups",
+                        to="polls.poll",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("poll", "bucket", "option")},
+            },
+        ),
+    ]
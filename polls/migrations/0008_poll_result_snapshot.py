@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0007_vote_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PollResultSnapshot",
+            fields=[
+                (
+                    "poll",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="result_snapshot",
+                        serialize=False,
+                        to="polls.poll",
+                    ),
+                ),
+                ("total_votes", models.PositiveIntegerField()),
+                ("results", models.JSONField()),
+                ("timeline", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.DeleteModel(
+            name="VoteRollup",
+        ),
+    ]
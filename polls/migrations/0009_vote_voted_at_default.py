@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:57
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("polls", "0008_poll_result_snapshot"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vote",
+            name="voted_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -16,6 +16,25 @@ class Poll(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     closes_at = models.DateTimeField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
+    # Denormalized counter, kept in step with the Vote table by polls.counters
+    total_votes = models.PositiveIntegerField(default=0)
+    # Bumped on every change to the poll, its options or its votes; backs
+    # the ETag / Last-Modified validators of the poll endpoints.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Listing order / cursor pagination
+            models.Index(fields=['created_at', 'id'], name='poll_created_idx'),
+            # Status filters and the expired-poll sweep
+            models.Index(fields=['status', 'closes_at'], name='poll_status_closes_idx'),
+        ]
+
+    @classmethod
+    def touch(cls, *poll_ids):
+        """Mark polls as modified without loading them."""
+        cls.objects.filter(pk__in=poll_ids).update(updated_at=timezone.now())
+
     def save(self, *args, **kwargs):
         if self.closes_at < timezone.now():
             self.status = 'closed'
@@ -26,6 +45,8 @@ class Poll(models.Model):
 class PollOption(models.Model):
     poll = models.ForeignKey(Poll, on_delete=models.CASCADE, related_name='options')
     text = models.CharField(max_length=255)
+    # Denormalized counter, kept in step with the Vote table by polls.counters
+    vote_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.poll.title} - {self.text}"
@@ -33,10 +54,17 @@ class Vote(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     option = models.ForeignKey(PollOption, on_delete=models.CASCADE)
     poll = models.ForeignKey(Poll, on_delete=models.CASCADE)
-    voted_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add, so imported ballots keep their time
+    voted_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         unique_together = ('user', 'poll')
+        indexes = [
+            # Per-option tallies within a poll
+            models.Index(fields=['poll', 'option'], name='vote_poll_option_idx'),
+            # Votes listing / cursor pagination and timelines within a poll
+            models.Index(fields=['poll', 'voted_at', 'id'], name='vote_poll_voted_idx'),
+        ]
 
     def __str__(self):
         return f"Vote by {self.user.username} on {self.option.text}"
@@ -47,6 +75,23 @@ class Vote(models.Model):
             self.poll = self.option.poll
         super().save(*args, **kwargs)
 
+
+class PollResultSnapshot(models.Model):
+    """
+    Final results of a closed poll, written once when it closes so reads
+    never have to count votes again. ``results`` has the shape of the
+    /results/ response; ``timeline`` holds per-minute vote counts as
+    parallel arrays (see polls/snapshots.py).
+    """
+    poll = models.OneToOneField(Poll, on_delete=models.CASCADE, primary_key=True, related_name='result_snapshot')
+    total_votes = models.PositiveIntegerField()
+    results = models.JSONField()
+    timeline = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Results of poll {self.poll_id} ({self.total_votes} votes)"
+
 # class Vote(models.Model):
 #     user = models.ForeignKey(User, on_delete=models.CASCADE)
 #     option = models.ForeignKey(PollOption, on_delete=models.CASCADE)
@@ -1,17 +1,22 @@
 from rest_framework import permissions
+from users.roles import has_role
 
 class IsOwnerOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user or request.user.roles.filter(name='admin').exists()
+        return obj.user_id == request.user.pk or has_role(request.user, 'admin')
 
 class IsCreator(permissions.BasePermission):
     def has_permission(self, request, view):
-        return request.user.roles.filter(name='creator').exists()
+        return has_role(request.user, 'creator')
 
 class IsPollOwnerOrAdmin(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # For poll options
-        return obj.poll.user == request.user or request.user.roles.filter(name='admin').exists()
+        return obj.poll.user_id == request.user.pk or has_role(request.user, 'admin')
+
+class IsAdmin(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return has_role(request.user, 'admin')
 
 class AllowAny(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -0,0 +1,72 @@
+# polls/results.py
+"""
+Aggregated poll results, read from the stored vote counters.
+
+A single query covers any number of open polls; closed polls are served
+from their result snapshot. Each poll's results are kept in the versioned
+poll cache, which every vote already invalidates.
+"""
+from . import cache as poll_cache
+from .models import Poll, PollResultSnapshot
+
+
+def build_results(rows):
+    """Group ``(poll_id, option_id, text, vote_count)`` rows, ordered by poll, into results."""
+    results = {}
+    for poll_id, option_id, text, vote_count in rows:
+        options = results.setdefault(poll_id, [])
+        if option_id is not None:
+            options.append({'id': option_id, 'text': text, 'votes': vote_count})
+
+    for poll_id, options in results.items():
+        total = sum(option['votes'] for option in options)
+        for option in options:
+            option['percentage'] = round(option['votes'] * 100 / total, 1) if total else 0.0
+        top = max((option['votes'] for option in options), default=0)
+        leaders = [option['id'] for option in options if option['votes'] == top]
+        results[poll_id] = {
+            'poll': poll_id,
+            'total_votes': total,
+            'options': options,
+            # None until someone votes, or while the top options are tied
+            'leader': leaders[0] if top and len(leaders) == 1 else None,
+        }
+    return results
+
+
+def results_queryset(poll_ids):
+    return (
+        Poll.objects
+        .filter(pk__in=poll_ids)
+        .order_by('pk', 'options__id')
+        .values_list('pk', 'options__id', 'options__text', 'options__vote_count')
+    )
+
+
+def load_results(poll_ids):
+    results = dict(
+        PollResultSnapshot.objects.filter(poll_id__in=poll_ids).values_list('poll_id', 'results')
+    )
+    remaining = [poll_id for poll_id in poll_ids if poll_id not in results]
+    if remaining:
+        results.update(build_results(results_queryset(remaining)))
+    return results
+
+
+def get_results(poll_ids):
+    """
+    Return ``{poll_id: results}`` for the polls that exist, serving what it
+    can from the cache and loading the rest with at most two queries.
+    """
+    results, versions = {}, {}
+    for poll_id in poll_ids:
+        version, payload = poll_cache.get_cached(poll_id, 'results')
+        if payload is None:
+            versions[poll_id] = version
+        else:
+            results[poll_id] = payload
+    if versions:
+        for poll_id, payload in load_results(list(versions)).items():
+            poll_cache.set_cached(poll_id, versions[poll_id], 'results', payload)
+            results[poll_id] = payload
+    return results
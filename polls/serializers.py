@@ -1,21 +1,17 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from users.models import User
 from .models import Poll, PollOption, Vote
-from users.serializers import UserSerializer
+from users.serializers import UserSerializer, UserSummarySerializer
 from django.utils import timezone
 
 class PollOptionSerializer(serializers.ModelSerializer):
-    vote_count = serializers.SerializerMethodField(read_only=True)
+    vote_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = PollOption
         fields = ['id', 'text', 'vote_count']
-    
-    def get_vote_count(self, obj) -> int:
-        # return obj.votes.count()
-        # Assuming Vote model has a ForeignKey to PollOption
-        return obj.vote_set.count()  
 
 # class VoteSerializer(serializers.ModelSerializer):
 #     user = UserSerializer()
@@ -77,23 +73,56 @@ class VoteSerializer(serializers.ModelSerializer):
             
 #         return poll
 
+class PollSummarySerializer(serializers.ModelSerializer):
+    """Lightweight read-only representation used for poll listings."""
+    options = PollOptionSerializer(many=True, read_only=True)
+    user = UserSummarySerializer(read_only=True)
+
+    class Meta:
+        model = Poll
+        fields = [
+            'id', 'user', 'title', 'description',
+            'created_at', 'closes_at', 'status',
+            'total_votes', 'options'
+        ]
+        read_only_fields = fields
+
+class PollListSerializer(serializers.ListSerializer):
+    """Creates a list of polls with one bulk INSERT for the polls and one for their options."""
+    def create(self, validated_data):
+        options_data = [attrs.pop('options') for attrs in validated_data]
+        with transaction.atomic():
+            polls = Poll.objects.bulk_create([Poll(**attrs) for attrs in validated_data], batch_size=500)
+            PollOption.objects.bulk_create(
+                [
+                    PollOption(poll=poll, **option_data)
+                    for poll, options in zip(polls, options_data)
+                    for option_data in options
+                ],
+                batch_size=1000,
+            )
+        return polls
+
 class PollSerializer(serializers.ModelSerializer):
+    # Votes are not embedded; PollViewSet.retrieve adds the first page of
+    # /polls/<id>/votes/ when the client asks for ?expand=votes.
     options = PollOptionSerializer(many=True)
     user = UserSerializer(read_only=True)
-    votes = VoteSerializer(many=True, read_only=True)
     status = serializers.CharField(read_only=True)
+    total_votes = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Poll
         fields = [
             'id', 'user', 'title', 'description', 
             'created_at', 'closes_at', 'status', 
-            'options', 'votes'
+            'total_votes', 'options'
         ]
         extra_kwargs = {
             'title': {'required': True},  # This makes title required
             'closes_at': {'required': True},
         }
+        list_serializer_class = PollListSerializer
     
     def validate_closes_at(self, value):
         """Validate that closes_at is in the future."""
@@ -103,9 +132,9 @@ class PollSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """Validate the overall poll data."""
-        # Ensure at least 2 options are provided
+        # Ensure at least 2 options are provided when creating a poll
         options = data.get('options', [])
-        if len(options) < 2:
+        if self.instance is None and len(options) < 2:
             raise serializers.ValidationError("A poll must have at least 2 options.")
         return data
     
@@ -113,13 +142,12 @@ class PollSerializer(serializers.ModelSerializer):
         # Extract the options data from the validated data
         options_data = validated_data.pop('options')
         
-        # Create the Poll instance first
-        poll = Poll.objects.create(**validated_data)
-        
-        # Iterate over the options data and create PollOption instances
-        for option_data in options_data:
-            PollOption.objects.create(poll=poll, **option_data)
-            
+        with transaction.atomic():
+            poll = Poll.objects.create(**validated_data)
+            # One INSERT for all the options
+            PollOption.objects.bulk_create(
+                [PollOption(poll=poll, **option_data) for option_data in options_data]
+            )
         return poll
 
 class PollOptionCreateSerializer(serializers.ModelSerializer):
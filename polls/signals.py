@@ -0,0 +1,80 @@
+# polls/signals.py
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from users.models import Role
+
+from .cache import invalidate_polls
+from .counters import apply_vote_deltas
+from .models import Poll, Vote
+from .snapshots import build_snapshots
+
+User = get_user_model()
+
+# User fields embedded in poll and vote representations (UserSerializer)
+EMBEDDED_USER_FIELDS = {'username', 'email', 'first_name', 'last_name', 'is_active'}
+
+
+def refresh_user_polls(user_ids):
+    """
+    Polls embed their owner and, in vote listings, their voters. Touch and
+    invalidate those polls, so cached bodies and ETags pick up the change.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    poll_ids = (
+        set(Poll.objects.filter(user_id__in=user_ids).values_list('pk', flat=True))
+        | set(Vote.objects.filter(user_id__in=user_ids).values_list('poll_id', flat=True))
+    )
+    if poll_ids:
+        Poll.touch(*poll_ids)
+        invalidate_polls(*poll_ids)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not EMBEDDED_USER_FIELDS.intersection(update_fields)):
+        return
+    refresh_user_polls([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def user_roles_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        refresh_user_polls([instance.pk])
+    elif action == 'pre_clear':
+        refresh_user_polls(instance.users.values_list('pk', flat=True))
+    else:
+        refresh_user_polls(pk_set or ())
+
+
+@receiver(post_save, sender=Role)
+def role_saved(sender, instance, created, **kwargs):
+    # A renamed role changes the role names of all its users
+    if not created:
+        refresh_user_polls(instance.users.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    # The cascade removes the user's votes without touching the counters.
+    # pre_delete runs inside the deletion's transaction, so the counters
+    # move together with the votes.
+    votes = list(Vote.objects.filter(user_id=instance.pk).values_list('poll_id', 'option_id', 'poll__status'))
+    if not votes:
+        return
+    apply_vote_deltas(
+        {option_id: -n for option_id, n in Counter(option_id for _, option_id, _ in votes).items()},
+        {poll_id: -n for poll_id, n in Counter(poll_id for poll_id, _, _ in votes).items()},
+    )
+    closed = sorted({poll_id for poll_id, _, status in votes if status == 'closed'})
+    if closed:
+        # Refreeze final results once the votes are gone
+        transaction.on_commit(lambda: build_snapshots(closed))
@@ -0,0 +1,80 @@
+# polls/snapshots.py
+"""
+Result snapshots of closed polls.
+
+When a poll closes its final per-option counts and its per-minute vote
+timeline are counted from the Vote table once and stored in a
+PollResultSnapshot. The results and timeline endpoints serve closed polls
+from that row alone.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Trunc
+
+from . import cache as poll_cache
+from .models import Poll, PollOption, PollResultSnapshot, Vote
+from .results import build_results
+
+
+def minute_timeline(rows, option_ids):
+    """
+    Per-minute ``(minute, option_id, votes)`` rows, ordered by minute, as
+    ``{'buckets': [epoch seconds], 'options': [ids], 'series': [[votes]]}``
+    with one series per option.
+    """
+    buckets, series = [], [[] for _ in option_ids]
+    position = {option_id: i for i, option_id in enumerate(option_ids)}
+    for minute, option_id, votes in rows:
+        at = int(minute.timestamp())
+        if not buckets or buckets[-1] != at:
+            buckets.append(at)
+            for values in series:
+                values.append(0)
+        series[position[option_id]][-1] = votes
+    return {'buckets': buckets, 'options': list(option_ids), 'series': series}
+
+
+def build_snapshots(poll_ids):
+    """(Re)write the snapshots of the given polls from their votes; returns how many were written."""
+    poll_ids = list(Poll.objects.filter(pk__in=poll_ids).values_list('pk', flat=True))
+    options = defaultdict(list)
+    for poll_id, option_id, text in (
+        PollOption.objects.filter(poll_id__in=poll_ids).order_by('poll_id', 'id').values_list('poll_id', 'id', 'text')
+    ):
+        options[poll_id].append((option_id, text))
+
+    votes = Vote.objects.filter(poll_id__in=poll_ids)
+    counts = dict(
+        ((poll_id, option_id), n)
+        for poll_id, option_id, n in votes.values_list('poll_id', 'option_id').annotate(n=Count('id')).order_by()
+    )
+    minutes = defaultdict(list)
+    for poll_id, minute, option_id, n in (
+        votes.annotate(minute=Trunc('voted_at', 'minute'))
+        .values_list('poll_id', 'minute', 'option_id').annotate(n=Count('id'))
+        .order_by('poll_id', 'minute', 'option_id')
+    ):
+        minutes[poll_id].append((minute, option_id, n))
+
+    rows = [
+        (poll_id, option_id, text, counts.get((poll_id, option_id), 0))
+        for poll_id in poll_ids
+        for option_id, text in options[poll_id] or [(None, None)]
+    ]
+    results = build_results(rows)
+    snapshots = [
+        PollResultSnapshot(
+            poll_id=poll_id,
+            total_votes=results[poll_id]['total_votes'],
+            results=results[poll_id],
+            timeline=minute_timeline(minutes[poll_id], [option_id for option_id, _ in options[poll_id]]),
+        )
+        for poll_id in poll_ids
+    ]
+    with transaction.atomic():
+        PollResultSnapshot.objects.filter(poll_id__in=poll_ids).delete()
+        PollResultSnapshot.objects.bulk_create(snapshots)
+        poll_cache.invalidate_polls(*poll_ids)
+    return len(snapshots)
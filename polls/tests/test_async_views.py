@@ -0,0 +1,165 @@
+# kuranet/polls/tests/test_async_views.py
+import json
+from unittest import mock
+from django.test import AsyncRequestFactory, RequestFactory, override_settings
+from rest_framework.test import APITestCase, APITransactionTestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, Vote
+from polls.async_views import poll_results_stream
+from polls.events import get_broker
+from users.models import User
+from users.serializers import RoleTokenObtainPairSerializer
+from django.utils import timezone
+
+
+class AsyncViewTests(APITransactionTestCase):
+    # The async views run in autocommit, like they do under ASGI; a failed
+    # insert would otherwise break the test case's wrapping transaction.
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="asyncvoter", password="testpass", email="async@example.com")
+        self.poll = Poll.objects.create(
+            title="Async Poll",
+            user=self.user,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.other_option = PollOption.objects.create(poll=self.poll, text="B")
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.auth = {"headers": {"Authorization": f"Bearer {token}"}}
+        self.vote_url = reverse("poll-votes-async", kwargs={"poll_id": self.poll.id})
+
+    async def test_server_timing_counts_async_queries(self):
+        response = await self.async_client.get(reverse("poll-detail-async", kwargs={"pk": self.poll.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+
+    async def test_vote_bumps_counters(self):
+        response = await self.async_client.post(
+            self.vote_url, {"option_id": self.option.id}, content_type="application/json", **self.auth
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        option = await PollOption.objects.aget(pk=self.option.id)
+        poll = await Poll.objects.aget(pk=self.poll.id)
+        self.assertEqual(option.vote_count, 1)
+        self.assertEqual(poll.total_votes, 1)
+
+    async def test_vote_makes_one_thread_hop(self):
+        from polls import async_views
+
+        with mock.patch.object(async_views, "sync_to_async", wraps=async_views.sync_to_async) as hop:
+            response = await self.async_client.post(
+                self.vote_url, {"option_id": self.option.id}, content_type="application/json", **self.auth
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(hop.call_count, 1)
+
+    async def test_duplicate_and_foreign_votes_are_rejected(self):
+        await self.async_client.post(self.vote_url, {"option_id": self.option.id}, **self.auth)
+        duplicate = await self.async_client.post(self.vote_url, {"option_id": self.other_option.id}, **self.auth)
+        self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(duplicate.json(), {"error": "You have already voted in this poll"})
+        invalid = await self.async_client.post(self.vote_url, {"option_id": "abc"}, **self.auth)
+        self.assertEqual(invalid.json(), {"error": "Invalid option"})
+        self.assertEqual((await Poll.objects.aget(pk=self.poll.id)).total_votes, 1)
+
+    async def test_rejected_votes_leave_no_rows_behind(self):
+        other_poll = await Poll.objects.acreate(
+            title="Other", user=self.user, closes_at=timezone.now() + timezone.timedelta(days=1)
+        )
+        foreign = await PollOption.objects.acreate(poll=other_poll, text="C")
+        invalid = await self.async_client.post(self.vote_url, {"option_id": foreign.id}, **self.auth)
+        self.assertEqual(invalid.json(), {"error": "Invalid option"})
+
+        await Poll.objects.filter(pk=self.poll.id).aupdate(status="closed")
+        closed = await self.async_client.post(self.vote_url, {"option_id": self.option.id}, **self.auth)
+        self.assertEqual(closed.json(), {"error": "This poll is closed"})
+        self.assertFalse(await Vote.objects.aexists())
+        self.assertEqual((await PollOption.objects.aget(pk=self.option.id)).vote_count, 0)
+
+    async def test_vote_requires_authentication(self):
+        response = await self.async_client.post(self.vote_url, {"option_id": self.option.id})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.post(self.vote_url, {"option_id": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.async_client.post(
+            self.vote_url, {"option_id": self.option.id}, headers={"Authorization": "Bearer nonsense"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_poll_detail_matches_sync_endpoint(self):
+        response = await self.async_client.get(reverse("poll-detail-async", kwargs={"pk": self.poll.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sync_response = await self.async_client.get(reverse("poll-detail", kwargs={"pk": self.poll.id}))
+        self.assertEqual(response.content, sync_response.content)
+        missing = await self.async_client.get(reverse("poll-detail-async", kwargs={"pk": self.poll.id + 100}))
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@override_settings(POLL_STREAM_MAX_RATE=50)
+class ResultsStreamTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="viewer", password="testpass", email="viewer@example.com")
+        self.poll = Poll.objects.create(
+            title="Streamed Poll",
+            user=self.user,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A", vote_count=3)
+        self.other_option = PollOption.objects.create(poll=self.poll, text="B")
+
+    @staticmethod
+    def parse(chunk):
+        event, data = (chunk.decode() if isinstance(chunk, bytes) else chunk).strip().split("\n")
+        return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    async def test_stream_sends_snapshot_then_coalesced_deltas(self):
+        response = await poll_results_stream(AsyncRequestFactory().get("/"), self.poll.id)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        chunks = aiter(response.streaming_content)
+
+        event, data = self.parse(await anext(chunks))
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(data["options"], {str(self.option.id): 3, str(self.other_option.id): 0})
+        self.assertEqual(data["total_votes"], 3)
+
+        broker = get_broker()
+        broker.publish(self.poll.id, {self.option.id: 1})
+        self.assertEqual(self.parse(await anext(chunks)), ("delta", {
+            "poll": self.poll.id, "options": {str(self.option.id): 1}, "total_votes": 1,
+        }))
+
+        # Published while the stream is throttled: delivered as one message
+        broker.publish(self.poll.id, {self.option.id: 1})
+        broker.publish(self.poll.id, {self.other_option.id: 1})
+        broker.publish(self.poll.id, {self.option.id: 1})
+        event, data = self.parse(await anext(chunks))
+        self.assertEqual(data["options"], {str(self.option.id): 2, str(self.other_option.id): 1})
+        self.assertEqual(data["total_votes"], 3)
+
+        await chunks.aclose()
+
+    async def test_stream_for_missing_poll_is_404(self):
+        response = await poll_results_stream(AsyncRequestFactory().get("/"), self.poll.id + 100)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_stream_is_refused_under_wsgi(self):
+        response = await poll_results_stream(RequestFactory().get("/"), self.poll.id)
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_subscription_close_unsubscribes(self):
+        broker = get_broker()
+        subscription = broker.subscribe(self.poll.id)
+        self.assertEqual(broker.subscriber_count(self.poll.id), 1)
+        subscription.close()
+        self.assertEqual(broker.subscriber_count(self.poll.id), 0)
+
+    def test_recorded_vote_is_published_after_commit(self):
+        self.client.force_authenticate(user=self.user)
+        with mock.patch("polls.events.get_broker") as get_broker_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    reverse("poll-votes", kwargs={"poll_id": self.poll.id}), {"option_id": self.other_option.id}
+                )
+        get_broker_mock.return_value.publish.assert_called_once_with(self.poll.id, {self.other_option.id: 1})
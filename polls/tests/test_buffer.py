@@ -0,0 +1,80 @@
+# kuranet/polls/tests/test_buffer.py
+from unittest import mock
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, Vote
+from polls.counters import insert_votes
+from polls.buffer import DUPLICATE, INVALID, RECORDED, VoteBuffer
+from users.models import User
+from django.utils import timezone
+
+
+class VoteBufferTests(APITestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f"buffered{i}", password="testpass", email=f"buffered{i}@example.com")
+            for i in range(3)
+        ]
+        self.poll = Poll.objects.create(
+            title="Buffered Poll",
+            user=self.users[0],
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.other_option = PollOption.objects.create(poll=self.poll, text="B")
+        self.buffer = VoteBuffer(batch_size=2, autostart=False)
+
+    def test_flush_writes_batches_and_reports_outcomes(self):
+        Vote.objects.create(user=self.users[2], option=self.option)
+        futures = [
+            self.buffer.submit(self.users[0].pk, self.option.pk, self.poll.pk),
+            self.buffer.submit(self.users[1].pk, self.other_option.pk, self.poll.pk),
+            self.buffer.submit(self.users[0].pk, self.other_option.pk, self.poll.pk),
+            self.buffer.submit(self.users[2].pk, self.option.pk, self.poll.pk),
+            self.buffer.submit(self.users[1].pk, self.option.pk, self.poll.pk + 1),
+        ]
+        outcomes = self.buffer.flush()
+        self.assertEqual(
+            [future.result(timeout=0) for future in futures],
+            [RECORDED, RECORDED, DUPLICATE, DUPLICATE, INVALID],
+        )
+        self.assertEqual(outcomes, {RECORDED: 2, DUPLICATE: 2, INVALID: 1})
+        self.assertEqual(Vote.objects.count(), 3)
+        self.option.refresh_from_db()
+        self.other_option.refresh_from_db()
+        self.poll.refresh_from_db()
+        self.assertEqual((self.option.vote_count, self.other_option.vote_count), (1, 1))
+        self.assertEqual(self.poll.total_votes, 2)
+
+    def test_vote_written_elsewhere_during_flush_is_reported_as_duplicate(self):
+        from polls import buffer as vote_buffer
+
+        def insert_after_other_worker(rows, **kwargs):
+            # Another worker records the same user's vote after the duplicate check
+            Vote.objects.create(user=self.users[0], option=self.option, poll=self.poll)
+            return insert_votes(rows, **kwargs)
+
+        futures = [
+            self.buffer.submit(self.users[0].pk, self.option.pk, self.poll.pk),
+            self.buffer.submit(self.users[1].pk, self.option.pk, self.poll.pk),
+        ]
+        with mock.patch.object(vote_buffer, "insert_votes", side_effect=insert_after_other_worker):
+            self.buffer.flush()
+        self.assertEqual([future.result(timeout=0) for future in futures], [DUPLICATE, RECORDED])
+        self.option.refresh_from_db()
+        self.poll.refresh_from_db()
+        self.assertEqual((self.option.vote_count, self.poll.total_votes), (1, 1))
+
+    @override_settings(VOTE_BUFFER_ENABLED=True, VOTE_BUFFER_WAIT=0)
+    def test_view_queues_vote_when_buffer_enabled(self):
+        self.client.force_authenticate(user=self.users[0])
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        with mock.patch("polls.buffer.get_vote_buffer", return_value=self.buffer):
+            response = self.client.post(url, {"option_id": self.option.id})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(Vote.objects.exists())
+
+        self.buffer.flush()
+        self.assertTrue(Vote.objects.filter(user=self.users[0], poll=self.poll).exists())
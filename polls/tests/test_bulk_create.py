@@ -0,0 +1,68 @@
+# kuranet/polls/tests/test_bulk_create.py
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption
+from users.models import User
+from django.utils import timezone
+
+
+class PollBulkCreateTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="testpass", email="importer@example.com")
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("poll-bulk-create")
+
+    def payload(self, count, options=3):
+        closes_at = (timezone.now() + timezone.timedelta(days=1)).isoformat()
+        return [
+            {
+                "title": f"Imported {i}",
+                "closes_at": closes_at,
+                "options": [{"text": f"Option {j}"} for j in range(options)],
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create_uses_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.post(self.url, self.payload(2), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post(self.url, self.payload(30, options=10), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+        self.assertEqual(response.data["created"], 30)
+        polls = Poll.objects.filter(pk__in=response.data["ids"])
+        self.assertEqual(polls.count(), 30)
+        self.assertTrue(all(poll.user_id == self.user.pk for poll in polls))
+        self.assertEqual(PollOption.objects.filter(poll__in=polls).count(), 300)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        payload = self.payload(3)
+        payload[1]["options"] = payload[1]["options"][:1]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("non_field_errors", response.data[1])
+        self.assertFalse(Poll.objects.exists())
+
+    def test_bulk_create_requires_a_list(self):
+        self.assertEqual(self.client.post(self.url, [], format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.client.post(self.url, self.payload(1)[0], format="json").status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.post(self.url, self.payload(1), format="json").status_code,
+                         status.HTTP_401_UNAUTHORIZED)
+
+    def test_single_create_inserts_options_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse("poll-list"), self.payload(1, options=10)[0], format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        inserts = [query for query in ctx.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        self.assertEqual(len(response.data["options"]), 10)
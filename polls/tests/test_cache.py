@@ -0,0 +1,71 @@
+# kuranet/polls/tests/test_cache.py
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from polls import cache as poll_cache
+from polls.checks import check_poll_cache
+from polls.models import Poll, PollOption
+from users.models import User
+from django.utils import timezone
+
+
+class PollCacheTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Cached Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.url = reverse("poll-detail", kwargs={"pk": self.poll.id})
+
+    def test_repeated_reads_skip_the_database(self):
+        first = self.client.get(self.url)
+        # Only the ETag validators are read
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(first.content, second.content)
+
+    def test_vote_invalidates_cached_poll(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("poll-votes", kwargs={"poll_id": self.poll.id}), {"option_id": self.option.id}
+            )
+        self.assertEqual(self.client.get(self.url).json()["total_votes"], 1)
+
+    def test_option_update_invalidates_cached_poll(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("poll-option-detail", kwargs={"poll_id": self.poll.id, "pk": self.option.id}),
+                {"text": "Renamed"},
+            )
+        self.assertEqual(self.client.get(self.url).json()["options"][0]["text"], "Renamed")
+
+    def test_poll_update_invalidates_cached_poll(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(user=self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {"title": "Renamed"})
+        self.assertEqual(self.client.get(self.url).json()["title"], "Renamed")
+
+
+    @override_settings(WEB_CONCURRENCY=3)
+    def test_process_local_cache_is_off_with_several_workers(self):
+        self.client.get(self.url)
+        # As when another worker renamed it: no bump reaches this process
+        Poll.objects.filter(pk=self.poll.id).update(title="Renamed")
+        self.assertEqual(self.client.get(self.url).json()["title"], "Renamed")
+        self.assertEqual([warning.id for warning in check_poll_cache(None)], ["polls.W001"])
+
+    @override_settings(
+        WEB_CONCURRENCY=3,
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache", "LOCATION": "cache:11211"}},
+    )
+    def test_shared_backend_keeps_the_cache_on(self):
+        self.assertTrue(poll_cache.is_enabled())
+        self.assertEqual(check_poll_cache(None), [])
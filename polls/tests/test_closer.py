@@ -0,0 +1,60 @@
+# kuranet/polls/tests/test_closer.py
+from io import StringIO
+from django.core.management import call_command
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, PollResultSnapshot, Vote
+from polls.buffer import CLOSED, VoteBuffer
+from users.models import User
+from django.utils import timezone
+
+
+class PollCloserTests(APITransactionTestCase):
+    # Runs in autocommit so the cache is invalidated before it is warmed,
+    # as it is outside tests.
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Expiring Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.open_poll = Poll.objects.create(
+            title="Open Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        # Expire without going through save(), as time passing would
+        Poll.objects.filter(pk=self.poll.pk).update(closes_at=timezone.now() - timezone.timedelta(minutes=1))
+        self.client.force_authenticate(user=self.owner)
+
+    def test_closer_flips_expired_polls_and_warms_results(self):
+        Vote.objects.create(user=self.owner, option=self.option, poll=self.poll)
+        call_command("close_expired_polls", stdout=StringIO())
+        self.poll.refresh_from_db()
+        self.open_poll.refresh_from_db()
+        self.assertEqual(self.poll.status, "closed")
+        self.assertEqual(self.open_poll.status, "draft")
+        self.assertEqual(PollResultSnapshot.objects.get(poll=self.poll).total_votes, 1)
+        with self.assertNumQueries(1):  # only the conditional GET validators
+            response = self.client.get(reverse("poll-results", kwargs={"pk": self.poll.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_vote_on_expired_poll_is_rejected(self):
+        response = self.client.post(
+            reverse("poll-votes", kwargs={"poll_id": self.poll.id}), {"option_id": self.option.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "This poll is closed"})
+        self.assertFalse(Vote.objects.filter(poll=self.poll).exists())
+        self.option.refresh_from_db()
+        self.assertEqual(self.option.vote_count, 0)
+
+    def test_buffered_vote_on_closed_poll_is_rejected(self):
+        vote_buffer = VoteBuffer(autostart=False)
+        future = vote_buffer.submit(self.owner.pk, self.option.pk, self.poll.pk)
+        vote_buffer.flush()
+        self.assertEqual(future.result(), CLOSED)
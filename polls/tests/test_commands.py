@@ -0,0 +1,58 @@
+# kuranet/polls/tests/test_commands.py
+from io import StringIO
+from django.core.management import CommandError, call_command
+from rest_framework.test import APITestCase
+from polls.models import Poll, Vote
+from polls.counters import recount_votes
+from users.models import User
+
+
+class SeedCommandTests(APITestCase):
+    def seed(self, **options):
+        call_command("seed", users=30, polls=9, votes_per_poll=12, seed=7, stdout=StringIO(), **options)
+        return sorted(Vote.objects.values_list("user__username", "poll__title", "option__text"))
+
+    def test_seed_is_reproducible_and_counters_match(self):
+        first = self.seed()
+        self.assertEqual(User.objects.filter(username__startswith="user").count(), 30)
+        self.assertEqual(Poll.objects.count(), 9)
+        self.assertEqual(
+            Vote.objects.count(), 12 * Poll.objects.exclude(status="draft").count()
+        )
+        self.assertEqual(recount_votes(commit=False), [])
+        self.assertTrue(User.objects.get(username="user1").check_password("password123"))
+        self.assertEqual(self.seed(), first)
+
+    def test_votes_per_poll_cannot_exceed_users(self):
+        with self.assertRaises(CommandError):
+            call_command("seed", users=5, votes_per_poll=6, stdout=StringIO())
+
+
+class BenchmarkApiTests(APITestCase):
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        from polls.management.commands.benchmark_api import Command
+
+        def run(rps, p95):
+            return {"scenarios": {"poll_list": {"throughput_rps": rps, "p50_ms": 5, "p95_ms": p95, "p99_ms": 20}}}
+
+        command = Command(stdout=StringIO())
+        command.compare(run(100, 10), run(90, 11), tolerance=0.2)
+        with self.assertRaisesMessage(CommandError, "2 metrics regressed"):
+            command.compare(run(100, 10), run(70, 13), tolerance=0.2)
+
+    def test_scenario_exceptions_are_counted_as_errors(self):
+        from polls.management.commands.benchmark_api import Command
+
+        command = Command(stdout=StringIO())
+
+        def scenario_broken(client):
+            raise RuntimeError("database is locked")
+
+        command.scenario_broken = scenario_broken
+        result = command.run_scenario("broken", count=5, warmup=1, concurrency=2)
+        self.assertEqual((result["requests"], result["errors"]), (5, 5))
+        self.assertEqual(result["status_codes"], {"500": 5})
+
+    def test_vote_create_needs_a_user_per_request(self):
+        with self.assertRaises(CommandError):
+            call_command("benchmark_api", scenarios=["vote_create"], users=10, requests=20, stdout=StringIO())
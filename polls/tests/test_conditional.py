@@ -0,0 +1,92 @@
+# kuranet/polls/tests/test_conditional.py
+from django.db.models import F
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption
+from users.models import Role, User
+from django.utils import timezone
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Conditional Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.client.force_authenticate(user=self.owner)
+
+    def test_poll_detail_if_none_match(self):
+        url = reverse("poll-detail", kwargs={"pk": self.poll.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # Only the validators are read
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_writes_without_local_invalidation_change_the_etag(self):
+        # As when another worker took the vote: this process's cache is untouched
+        url = reverse("poll-detail", kwargs={"pk": self.poll.id})
+        etag = self.client.get(url)["ETag"]
+        Poll.objects.filter(pk=self.poll.id).update(
+            total_votes=F("total_votes") + 1, updated_at=timezone.now() + timezone.timedelta(seconds=1)
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertNotEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_poll_detail_if_modified_since(self):
+        url = reverse("poll-detail", kwargs={"pk": self.poll.id})
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_owner_profile_and_role_changes_change_the_detail(self):
+        url = reverse("poll-detail", kwargs={"pk": self.poll.id})
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.first_name = "Renamed"
+            self.owner.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["user"]["first_name"], "Renamed")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.roles.add(Role.objects.get_or_create(name="creator")[0])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([role["name"] for role in response.json()["user"]["roles"]], ["creator"])
+
+    def test_vote_changes_etags(self):
+        votes_url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        options_url = reverse("poll-options", kwargs={"poll_id": self.poll.id})
+        votes_etag = self.client.get(votes_url)["ETag"]
+        options_etag = self.client.get(options_url)["ETag"]
+        self.assertEqual(
+            self.client.get(votes_url, HTTP_IF_NONE_MATCH=votes_etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(votes_url, {"option_id": self.option.id})
+
+        response = self.client.get(votes_url, HTTP_IF_NONE_MATCH=votes_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], votes_etag)
+        response = self.client.get(options_url, HTTP_IF_NONE_MATCH=options_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_pages_have_distinct_etags(self):
+        votes_url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        first = self.client.get(votes_url)["ETag"]
+        second = self.client.get(votes_url, {"page_size": 1})["ETag"]
+        self.assertNotEqual(first, second)
@@ -0,0 +1,121 @@
+# kuranet/polls/tests/test_counters.py
+from io import StringIO
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, Vote
+from polls.counters import record_vote, recount_votes
+from users.authentication import ClaimsUser
+from users.models import User
+from users.serializers import RoleTokenObtainPairSerializer
+from django.utils import timezone
+
+
+class VoteCounterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="voter", password="testpass", email="voter@example.com")
+        self.poll = Poll.objects.create(
+            title="Counter Poll",
+            user=self.user,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.other_option = PollOption.objects.create(poll=self.poll, text="B")
+        self.client.force_authenticate(user=self.user)
+
+    def test_vote_bumps_counters(self):
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        response = self.client.post(url, {"option_id": self.option.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.option.refresh_from_db()
+        self.other_option.refresh_from_db()
+        self.poll.refresh_from_db()
+        self.assertEqual(self.option.vote_count, 1)
+        self.assertEqual(self.other_option.vote_count, 0)
+        self.assertEqual(self.poll.total_votes, 1)
+
+    def test_deleting_an_option_takes_its_votes_off_the_poll(self):
+        self.client.post(reverse("poll-votes", kwargs={"poll_id": self.poll.id}), {"option_id": self.option.id})
+        url = reverse("poll-option-detail", kwargs={"poll_id": self.poll.id, "pk": self.option.id})
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.total_votes, 0)
+        response = self.client.get(reverse("poll-detail", kwargs={"pk": self.poll.id}))
+        self.assertEqual(response.json()["total_votes"], 0)
+        self.assertEqual(recount_votes(commit=False), [])
+
+    def test_deleting_a_user_takes_their_votes_off_the_counters(self):
+        voter = User.objects.create_user(username="leaver", password="testpass", email="leaver@example.com")
+        Vote.objects.create(user=voter, option=self.option, poll=self.poll)
+        record_vote(self.option.id, self.poll.id)
+        self.client.post(reverse("poll-votes", kwargs={"poll_id": self.poll.id}), {"option_id": self.other_option.id})
+        voter.delete()
+        self.option.refresh_from_db()
+        self.poll.refresh_from_db()
+        self.assertEqual((self.option.vote_count, self.poll.total_votes), (0, 1))
+        self.assertEqual(recount_votes(commit=False), [])
+
+    def test_duplicate_vote_does_not_bump_counters(self):
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        self.client.post(url, {"option_id": self.option.id})
+        response = self.client.post(url, {"option_id": self.other_option.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.total_votes, 1)
+
+    def test_vote_for_option_of_another_poll_is_rejected(self):
+        other_poll = Poll.objects.create(
+            title="Other Poll",
+            user=self.user,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        foreign_option = PollOption.objects.create(poll=other_poll, text="X")
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        response = self.client.post(url, {"option_id": foreign_option.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Invalid option"})
+        self.assertFalse(Vote.objects.exists())
+        foreign_option.refresh_from_db()
+        self.assertEqual(foreign_option.vote_count, 0)
+
+    def test_vote_without_option_is_rejected(self):
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        response = self.client.post(url, {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_vote_round_trips(self):
+        # savepoint, vote INSERT, option UPDATE, poll UPDATE, release
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        with self.assertNumQueries(5):
+            response = self.client.post(url, {"option_id": self.option.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_vote_with_stateless_user(self):
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.client.force_authenticate(user=ClaimsUser(token))
+        url = reverse("poll-votes", kwargs={"poll_id": self.poll.id})
+        with self.assertNumQueries(5):
+            response = self.client.post(url, {"option_id": self.option.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Vote.objects.filter(user=self.user, poll=self.poll).exists())
+
+    def test_serializer_reads_stored_counter(self):
+        PollOption.objects.filter(pk=self.option.pk).update(vote_count=7)
+        response = self.client.get(reverse("poll-detail", kwargs={"pk": self.poll.id}))
+        counts = {opt["text"]: opt["vote_count"] for opt in response.json()["options"]}
+        self.assertEqual(counts, {"A": 7, "B": 0})
+
+    def test_recount_votes_command_fixes_drift(self):
+        Vote.objects.create(user=self.user, option=self.option)
+        out = StringIO()
+        call_command("recount_votes", "--dry-run", stdout=out)
+        self.assertIn("2 counters have drifted", out.getvalue())
+        self.option.refresh_from_db()
+        self.assertEqual(self.option.vote_count, 0)
+
+        call_command("recount_votes", stdout=StringIO())
+        self.option.refresh_from_db()
+        self.poll.refresh_from_db()
+        self.assertEqual(self.option.vote_count, 1)
+        self.assertEqual(self.poll.total_votes, 1)
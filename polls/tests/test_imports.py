@@ -0,0 +1,122 @@
+# kuranet/polls/tests/test_imports.py
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, PollResultSnapshot, Vote
+from polls.counters import insert_votes, recount_votes
+from users.models import Role, User
+from django.utils import timezone
+
+
+class VoteImportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="testpass", email="admin@example.com")
+        self.admin.roles.add(Role.objects.get_or_create(name="admin")[0])
+        self.voters = [
+            User.objects.create_user(username=f"ballot{i}", password="testpass", email=f"ballot{i}@example.com")
+            for i in range(3)
+        ]
+        self.poll = Poll.objects.create(
+            title="Paper Poll",
+            user=self.admin,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.first = PollOption.objects.create(poll=self.poll, text="A")
+        self.second = PollOption.objects.create(poll=self.poll, text="B")
+        self.url = reverse("vote-import")
+
+    def ndjson(self, *records):
+        return "\n".join(json.dumps(record) for record in records) + "\n"
+
+    def test_ndjson_import_writes_votes_and_counters(self):
+        self.client.force_authenticate(user=self.admin)
+        voted_at = "2026-01-02T03:04:05Z"
+        body = self.ndjson(
+            {"user_id": self.voters[0].pk, "option_id": self.first.pk, "voted_at": voted_at},
+            {"user_id": self.voters[1].pk, "option_id": self.second.pk},
+            {"user_id": self.voters[0].pk, "option_id": self.second.pk},
+            {"user_id": 999999, "option_id": self.first.pk},
+            {"user_id": self.voters[2].pk, "option_id": 999999},
+            {"user_id": "x"},
+        ) + "not json\n"
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.generic("POST", self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["imported"], 2)
+        self.assertEqual(response.data["duplicates"], 1)
+        self.assertEqual(response.data["rejected"], 4)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [6, 7, 3, 4, 5])
+
+        vote = Vote.objects.get(user=self.voters[0])
+        self.assertEqual(vote.voted_at.isoformat(), "2026-01-02T03:04:05+00:00")
+        self.poll.refresh_from_db()
+        self.assertEqual(self.poll.total_votes, 2)
+        self.assertEqual(recount_votes([self.poll.pk], commit=False), [])
+
+    def test_csv_import_and_existing_votes(self):
+        Vote.objects.create(user=self.voters[0], option=self.first, poll=self.poll)
+        path = self.write_csv(
+            "user_id,option_id,voted_at\n"
+            f"{self.voters[0].pk},{self.second.pk},\n"
+            f"{self.voters[1].pk},{self.second.pk},2026-01-02T03:04:05\n"
+        )
+        out = StringIO()
+        call_command("import_votes", path, stdout=out)
+        self.assertIn("Imported 1 ballots (1 duplicates, 0 rejected)", out.getvalue())
+        self.assertTrue(Vote.objects.filter(user=self.voters[1], option=self.second).exists())
+
+    def test_vote_cast_live_during_import_counts_as_duplicate(self):
+        from polls import imports
+
+        def insert_after_live_vote(rows, **kwargs):
+            Vote.objects.create(user=self.voters[0], option=self.first, poll=self.poll)
+            return insert_votes(rows, **kwargs)
+
+        lines = self.ndjson(
+            {"user_id": self.voters[0].pk, "option_id": self.first.pk},
+            {"user_id": self.voters[1].pk, "option_id": self.first.pk},
+        ).splitlines()
+        with mock.patch.object(imports, "insert_votes", side_effect=insert_after_live_vote):
+            report = imports.import_votes(lines)
+        self.assertEqual((report.imported, report.duplicates), (1, 1))
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.vote_count, 1)
+
+    def test_late_ballot_for_closed_poll_updates_snapshot(self):
+        closes_at = timezone.now() - timezone.timedelta(hours=1)
+        Poll.objects.filter(pk=self.poll.pk).update(status="closed", closes_at=closes_at)
+        call_command("rebuild_result_snapshots", stdout=StringIO())
+        voted_at = (closes_at - timezone.timedelta(hours=1)).isoformat()
+        path = self.write_csv(
+            "user_id,option_id,voted_at\n"
+            f"{self.voters[0].pk},{self.first.pk},{voted_at}\n"
+            f"{self.voters[1].pk},{self.first.pk},\n"
+        )
+        call_command("import_votes", path, stdout=StringIO())
+        self.assertEqual(PollResultSnapshot.objects.get(poll=self.poll).total_votes, 1)
+        self.assertEqual(Vote.objects.filter(poll=self.poll).count(), 1)
+
+    def test_import_is_admin_only(self):
+        body = self.ndjson({"user_id": self.voters[0].pk, "option_id": self.first.pk})
+        response = self.client.generic("POST", self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_authenticate(user=self.voters[0])
+        response = self.client.generic("POST", self.url, body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.generic("POST", self.url, body, content_type="application/xml")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        self.assertFalse(Vote.objects.exists())
+
+    def write_csv(self, content):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False)
+        with handle:
+            handle.write(content)
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
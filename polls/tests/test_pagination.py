@@ -0,0 +1,89 @@
+# kuranet/polls/tests/test_pagination.py
+import base64
+from urllib.parse import urlencode
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, Vote
+from users.models import User
+from django.utils import timezone
+
+
+class PaginationTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.client.force_authenticate(user=self.owner)
+
+    def create_polls(self, count):
+        return [
+            Poll.objects.create(
+                title=f"Poll {i}",
+                user=self.owner,
+                closes_at=timezone.now() + timezone.timedelta(days=1),
+            )
+            for i in range(count)
+        ]
+
+    def test_poll_list_walks_cursor_pages_without_count(self):
+        polls = self.create_polls(5)
+        url = reverse("poll-list")
+        seen = []
+        with CaptureQueriesContext(connection) as ctx:
+            while url:
+                response = self.client.get(url, {"page_size": 2} if "cursor" not in url else None)
+                self.assertNotIn("count", response.data)
+                seen.extend(poll["id"] for poll in response.data["results"])
+                url = response.data["next"]
+        self.assertEqual(seen, [poll.id for poll in reversed(polls)])
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
+
+    def test_vote_cursor_pages_through_shared_timestamps_without_offset(self):
+        poll = self.create_polls(1)[0]
+        option = PollOption.objects.create(poll=poll, text="A")
+        voted_at = timezone.now()
+        votes = Vote.objects.bulk_create(
+            Vote(user=User.objects.create_user(username=f"tie{i}", password="x", email=f"tie{i}@example.com"),
+                 option=option, poll=poll, voted_at=voted_at)
+            for i in range(5)
+        )
+        url = reverse("poll-votes", kwargs={"poll_id": poll.id})
+        seen, pages = [], []
+        with CaptureQueriesContext(connection) as ctx:
+            while url:
+                response = self.client.get(url, {"page_size": 2} if "cursor" not in url else None)
+                pages.append(response.data)
+                seen.extend(vote["id"] for vote in response.data["results"])
+                url = response.data["next"]
+        self.assertEqual(seen, [vote.id for vote in votes])
+        self.assertFalse(any("OFFSET" in q["sql"] for q in ctx.captured_queries))
+
+        back = self.client.get(pages[-1]["previous"]).data
+        self.assertEqual([vote["id"] for vote in back["results"]], seen[2:4])
+        self.assertEqual([vote["id"] for vote in self.client.get(back["previous"]).data["results"]], seen[:2])
+
+    def test_tampered_cursor_is_not_found(self):
+        poll = self.create_polls(1)[0]
+        urls = [reverse("poll-list"), reverse("poll-votes", kwargs={"poll_id": poll.id})]
+        for position in ['["abc", 1]', "[null, null]", '[{"a": 1}, 1]', '["2024-01-01T00:00:00+00:00", "x"]']:
+            cursor = base64.b64encode(urlencode({"p": position}).encode()).decode()
+            for url in urls:
+                with self.subTest(url=url, position=position):
+                    self.assertEqual(self.client.get(url, {"cursor": cursor}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_option_list_can_skip_count(self):
+        poll = self.create_polls(1)[0]
+        for i in range(3):
+            PollOption.objects.create(poll=poll, text=f"Option {i}")
+        url = reverse("poll-options", kwargs={"poll_id": poll.id})
+
+        counted = self.client.get(url)
+        self.assertEqual(counted.data["count"], 3)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"count": "false"})
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNone(response.data["next"])
+        self.assertFalse(any("COUNT(" in q["sql"] for q in ctx.captured_queries))
@@ -0,0 +1,124 @@
+# kuranet/polls/tests/test_queries.py
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, Vote
+from users.models import Role, User
+from django.utils import timezone
+
+
+class PollQueryBudgetTests(APITestCase):
+    """
+    Query-count regression harness for the poll list and retrieve endpoints.
+    The budgets must hold regardless of how many polls, options or votes exist.
+    """
+    LIST_BUDGET = 2      # polls + users, options
+    RETRIEVE_BUDGET = 4  # ETag validators, poll + user, user roles, options
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.owner.roles.add(Role.objects.create(name="creator"))
+        self.voters = [
+            User.objects.create_user(username=f"voter{i}", password="testpass", email=f"voter{i}@example.com")
+            for i in range(3)
+        ]
+
+    def create_polls(self, count):
+        polls = []
+        for i in range(count):
+            poll = Poll.objects.create(
+                title=f"Poll {i}",
+                user=self.owner,
+                closes_at=timezone.now() + timezone.timedelta(days=1),
+            )
+            options = [PollOption.objects.create(poll=poll, text=f"Option {j}") for j in range(3)]
+            for voter, option in zip(self.voters, options):
+                Vote.objects.create(user=voter, option=option, poll=poll)
+            polls.append(poll)
+        return polls
+
+    def assertQueriesAtMost(self, budget, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(
+            len(ctx.captured_queries), budget,
+            "\n".join(q["sql"] for q in ctx.captured_queries),
+        )
+        return response
+
+    def test_list_query_budget(self):
+        created = 0
+        for total in (1, 20, 100):
+            self.create_polls(total - created)
+            created = total
+            with self.subTest(polls=total):
+                self.assertQueriesAtMost(self.LIST_BUDGET, reverse("poll-list"))
+
+    def test_retrieve_query_budget(self):
+        created = 0
+        for total in (1, 20, 100):
+            polls = self.create_polls(total - created)
+            created = total
+            with self.subTest(polls=total):
+                self.assertQueriesAtMost(
+                    self.RETRIEVE_BUDGET, reverse("poll-detail", kwargs={"pk": polls[-1].id})
+                )
+
+
+class QueryPlanTests(APITestCase):
+    """EXPLAIN the SQL issued by the vote and option endpoints and reject full table scans."""
+    TABLES = ("polls_vote", "polls_polloption")
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        voters = User.objects.bulk_create(
+            User(username=f"planner{i}", email=f"planner{i}@example.com") for i in range(50)
+        )
+        self.polls = []
+        for p in range(5):
+            poll = Poll.objects.create(
+                title=f"Plan Poll {p}",
+                user=self.owner,
+                closes_at=timezone.now() + timezone.timedelta(days=1),
+            )
+            options = PollOption.objects.bulk_create(PollOption(poll=poll, text=f"Option {i}") for i in range(4))
+            Vote.objects.bulk_create(
+                Vote(user=voter, poll=poll, option=options[i % 4]) for i, voter in enumerate(voters)
+            )
+            self.polls.append(poll)
+        self.client.force_authenticate(user=self.owner)
+
+    def full_scans(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute("EXPLAIN QUERY PLAN " + sql)
+                plan = [row[-1] for row in cursor.fetchall()]
+                return [line for line in plan for table in self.TABLES
+                        if line.startswith(f"SCAN {table}") and "USING" not in line]
+            cursor.execute("EXPLAIN " + sql)
+            plan = [row[0] for row in cursor.fetchall()]
+            return [line for line in plan for table in self.TABLES if f"Seq Scan on {table}" in line]
+
+    def assertNoFullScans(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if sql.startswith("SELECT") and any(table in sql for table in self.TABLES):
+                self.assertEqual(self.full_scans(sql), [], sql)
+
+    def test_vote_endpoints_use_indexes(self):
+        poll = self.polls[2]
+        url = reverse("poll-votes", kwargs={"poll_id": poll.id})
+        self.assertNoFullScans(url)
+        next_page = self.client.get(url).data["next"]
+        self.assertNoFullScans(next_page)
+
+    def test_option_endpoints_use_indexes(self):
+        poll = self.polls[2]
+        self.assertNoFullScans(reverse("poll-options", kwargs={"poll_id": poll.id}))
+        self.assertNoFullScans(reverse("poll-detail", kwargs={"pk": poll.id}))
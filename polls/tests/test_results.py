@@ -0,0 +1,84 @@
+# kuranet/polls/tests/test_results.py
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption
+from users.models import User
+from django.utils import timezone
+
+
+class PollResultsTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Results Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.first = PollOption.objects.create(poll=self.poll, text="A", vote_count=3)
+        self.second = PollOption.objects.create(poll=self.poll, text="B", vote_count=1)
+        self.empty_poll = Poll.objects.create(
+            title="Empty Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        PollOption.objects.create(poll=self.empty_poll, text="X")
+        PollOption.objects.create(poll=self.empty_poll, text="Y")
+        self.url = reverse("poll-results", kwargs={"pk": self.poll.id})
+
+    def test_results_report_counts_percentages_and_leader(self):
+        with self.assertNumQueries(3):  # conditional GET validators, snapshot lookup, results
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "poll": self.poll.id,
+            "total_votes": 4,
+            "options": [
+                {"id": self.first.id, "text": "A", "votes": 3, "percentage": 75.0},
+                {"id": self.second.id, "text": "B", "votes": 1, "percentage": 25.0},
+            ],
+            "leader": self.first.id,
+        })
+        with self.assertNumQueries(1):  # conditional GET validators
+            self.client.get(self.url)
+
+    def test_vote_invalidates_cached_results(self):
+        self.client.get(self.url)
+        voter = User.objects.create_user(username="voter", password="testpass", email="voter@example.com")
+        self.client.force_authenticate(user=voter)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("poll-votes", kwargs={"poll_id": self.poll.id}), {"option_id": self.second.id})
+        data = self.client.get(self.url).data
+        self.assertEqual(data["total_votes"], 5)
+        self.assertEqual([option["votes"] for option in data["options"]], [3, 2])
+
+    def test_tied_results_have_no_leader(self):
+        PollOption.objects.filter(pk=self.second.id).update(vote_count=3)
+        self.assertIsNone(self.client.get(self.url).data["leader"])
+
+    def test_missing_poll_is_404(self):
+        response = self.client.get(reverse("poll-results", kwargs={"pk": self.poll.id + 100}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_batch_results_use_two_queries(self):
+        missing = self.poll.id + 100
+        url = reverse("poll-batch-results") + f"?ids={self.empty_poll.id},{self.poll.id},{missing}"
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["poll"] for result in response.data["results"]], [self.empty_poll.id, self.poll.id])
+        self.assertEqual(response.data["missing"], [missing])
+        empty = response.data["results"][0]
+        self.assertEqual(empty["total_votes"], 0)
+        self.assertIsNone(empty["leader"])
+        self.assertEqual([option["percentage"] for option in empty["options"]], [0.0, 0.0])
+
+    def test_batch_results_validate_ids(self):
+        self.assertEqual(self.client.get(reverse("poll-batch-results")).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse("poll-batch-results") + "?ids=1,x")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_async_results_match(self):
+        sync_response = await self.async_client.get(self.url)
+        response = await self.async_client.get(reverse("poll-results-async", kwargs={"poll_id": self.poll.id}))
+        self.assertEqual(response.json(), sync_response.json())
@@ -0,0 +1,88 @@
+# kuranet/polls/tests/test_timeline.py
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from polls.models import Poll, PollOption, PollResultSnapshot, Vote
+from polls.timeline import BUCKETS
+from users.models import User
+from django.utils import timezone
+
+
+class TimelineTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Timeline Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.first = PollOption.objects.create(poll=self.poll, text="A")
+        self.second = PollOption.objects.create(poll=self.poll, text="B")
+        start = timezone.now().replace(hour=10, minute=0, second=0, microsecond=0) - timezone.timedelta(days=1)
+        self.start = start
+        # 10:05 A, 10:20 A, 10:40 B, 12:10 B
+        for i, (minutes, option) in enumerate([(5, self.first), (20, self.first), (40, self.second), (130, self.second)]):
+            voter = User.objects.create_user(username=f"voter{i}", password="testpass", email=f"voter{i}@example.com")
+            vote = Vote.objects.create(user=voter, option=option, poll=self.poll)
+            Vote.objects.filter(pk=vote.pk).update(voted_at=start + timezone.timedelta(minutes=minutes))
+        self.url = reverse("poll-results-timeline", kwargs={"pk": self.poll.id})
+
+    def iso(self, hours):
+        return (self.start + timezone.timedelta(hours=hours)).isoformat().replace("+00:00", "Z")
+
+    def test_hourly_totals(self):
+        response = self.client.get(self.url, {"bucket": "1h"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "poll": self.poll.id,
+            "bucket": "1h",
+            "buckets": [self.iso(0), self.iso(2)],
+            "votes": [3, 1],
+        })
+
+    def test_split_by_option(self):
+        data = self.client.get(self.url, {"bucket": "1h", "by": "option"}).data
+        self.assertEqual(data["options"], [self.first.id, self.second.id])
+        self.assertEqual(data["series"], [[2, 0], [1, 1]])
+        self.assertEqual(data["votes"], [3, 1])
+
+    def test_closed_poll_is_served_from_snapshot(self):
+        expected = {
+            bucket: self.client.get(self.url, {"bucket": bucket, "by": "option"}).data for bucket in BUCKETS
+        }
+        Poll.objects.filter(pk=self.poll.id).update(status="closed")
+        call_command("rebuild_result_snapshots", stdout=StringIO())
+        snapshot = PollResultSnapshot.objects.get(poll=self.poll)
+        self.assertEqual(snapshot.total_votes, 4)
+        self.assertEqual(len(snapshot.timeline["buckets"]), 4)
+        for bucket in BUCKETS:
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(self.url, {"bucket": bucket, "by": "option"}).data
+            self.assertEqual(data, expected[bucket])
+            self.assertFalse(any("polls_vote" in query["sql"] for query in ctx.captured_queries))
+
+    def test_closed_poll_without_snapshot_builds_it(self):
+        Poll.objects.filter(pk=self.poll.id).update(status="closed")
+        data = self.client.get(self.url, {"bucket": "1h"}).data
+        self.assertEqual(data["votes"], [3, 1])
+        self.assertTrue(PollResultSnapshot.objects.filter(poll=self.poll).exists())
+
+    def test_closed_poll_results_come_from_snapshot(self):
+        Poll.objects.filter(pk=self.poll.id).update(status="closed")
+        call_command("rebuild_result_snapshots", "--poll", str(self.poll.id), stdout=StringIO())
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(reverse("poll-results", kwargs={"pk": self.poll.id})).data
+        # The stored counters were never bumped here; the snapshot counted the votes
+        self.assertEqual(data["total_votes"], 4)
+        self.assertEqual(data["leader"], None)
+        self.assertFalse(any("polls_polloption" in query["sql"] for query in ctx.captured_queries))
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(self.url, {"bucket": "7m"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {"by": "user"}).status_code, status.HTTP_400_BAD_REQUEST)
+        missing = reverse("poll-results-timeline", kwargs={"pk": self.poll.id + 100})
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
@@ -1,9 +1,10 @@
 # kuranet/polls/tests/test_views.py
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
-from polls.models import Poll
-from polls.serializers import PollSerializer
+from polls.models import Poll, PollOption, Vote
+from polls.counters import record_vote
 from users.models import User
 from django.utils import timezone
 
@@ -24,3 +25,75 @@ class PollViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # self.assertEqual(response.status_code, status.HTTP_200_OK)
         # self.assertEqual(response.data.get("results", [])[0]["title"], "Test Poll?")
+
+
+class PollRepresentationTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Expand Poll",
+            user=self.owner,
+            closes_at=timezone.now() + timezone.timedelta(days=1),
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+
+    def add_votes(self, count):
+        for i in range(count):
+            voter = User.objects.create_user(username=f"v{i}", password="testpass", email=f"v{i}@example.com")
+            Vote.objects.create(user=voter, option=self.option)
+            record_vote(self.option.id, self.poll.id)
+
+    def test_list_uses_summary_representation(self):
+        self.add_votes(2)
+        response = self.client.get(reverse("poll-list"))
+        poll = response.data["results"][0]
+        self.assertNotIn("votes", poll)
+        self.assertEqual(poll["user"], {"id": self.owner.id, "username": "owner"})
+        self.assertEqual(poll["total_votes"], 2)
+        self.assertEqual(poll["options"][0]["vote_count"], 2)
+
+    def test_retrieve_omits_votes_by_default(self):
+        self.add_votes(1)
+        response = self.client.get(reverse("poll-detail", kwargs={"pk": self.poll.id}))
+        self.assertNotIn("votes", response.json())
+
+    def test_retrieve_expand_votes_embeds_first_page(self):
+        self.add_votes(25)
+        response = self.client.get(
+            reverse("poll-detail", kwargs={"pk": self.poll.id}), {"expand": "votes"}
+        )
+        votes = response.data["votes"]
+        self.assertEqual(votes["count"], 25)
+        self.assertEqual(len(votes["results"]), 20)
+        self.assertIn(f"/api/v1/polls/{self.poll.id}/votes/?cursor=", votes["next"])
+
+        self.client.force_authenticate(user=self.owner)
+        second = self.client.get(votes["next"])
+        self.assertEqual(len(second.data["results"]), 5)
+        first_ids = {vote["id"] for vote in votes["results"]}
+        self.assertFalse(first_ids & {vote["id"] for vote in second.data["results"]})
+
+
+class StructuredLoggingTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="testpass", email="owner@example.com")
+        self.poll = Poll.objects.create(
+            title="Logged Poll", user=self.owner, closes_at=timezone.now() + timezone.timedelta(days=1)
+        )
+        self.option = PollOption.objects.create(poll=self.poll, text="A")
+        self.url = reverse("poll-option-detail", kwargs={"poll_id": self.poll.id, "pk": self.option.id})
+        self.client.force_authenticate(user=self.owner)
+
+    @override_settings(LOG_EVENT_SAMPLE_RATE=1.0)
+    def test_option_update_logs_a_structured_event(self):
+        with self.assertLogs("polls.views", "INFO") as logs:
+            response = self.client.patch(self.url, {"text": "B"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        record = logs.records[0]
+        self.assertEqual(record.event, "poll_option.updated")
+        self.assertEqual((record.poll_id, record.option_id, record.partial), (self.poll.id, self.option.id, True))
+
+    @override_settings(LOG_EVENT_SAMPLE_RATE=0.0)
+    def test_unsampled_events_are_dropped(self):
+        with self.assertNoLogs("polls.views", "INFO"):
+            self.client.patch(self.url, {"text": "B"}, format="json")
@@ -0,0 +1,112 @@
+# polls/timeline.py
+"""
+Vote timelines: votes per time bucket, counted in the database.
+
+Open polls are counted straight from the Vote table with Trunc/Count over
+the (poll, voted_at) index. A closed poll no longer changes, so its
+timeline is summed from the per-minute counts in its result snapshot.
+"""
+import datetime
+from collections import Counter
+
+from django.db.models import Count
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from . import cache as poll_cache
+from .models import Poll, PollOption, PollResultSnapshot, Vote
+from .snapshots import build_snapshots
+
+# Accepted ?bucket= values and the Trunc kind each maps to
+BUCKETS = {'1m': 'minute', '1h': 'hour', '1d': 'day', '1w': 'week'}
+
+
+def count_rows(poll_id, kind, by_option):
+    fields = ['at', 'option_id'] if by_option else ['at']
+    return (
+        Vote.objects
+        .filter(poll_id=poll_id)
+        .annotate(at=Trunc('voted_at', kind))
+        .values(*fields)
+        .annotate(votes=Count('id'))
+        .order_by(*fields)
+    )
+
+
+def truncate(at, kind):
+    """Python counterpart of Trunc for the kinds in BUCKETS."""
+    at = timezone.localtime(at).replace(second=0, microsecond=0)
+    if kind in ('hour', 'day', 'week'):
+        at = at.replace(minute=0)
+    if kind in ('day', 'week'):
+        at = at.replace(hour=0)
+    if kind == 'week':
+        at -= datetime.timedelta(days=at.weekday())
+    return at
+
+
+def snapshot_rows(timeline, kind, by_option):
+    """Re-bucket a snapshot's per-minute timeline into rows shaped like count_rows()."""
+    votes = Counter()
+    for i, minute in enumerate(timeline['buckets']):
+        at = truncate(datetime.datetime.fromtimestamp(minute, datetime.timezone.utc), kind)
+        for option_id, values in zip(timeline['options'], timeline['series']):
+            if values[i]:
+                votes[at, option_id if by_option else None] += values[i]
+    return [{'at': at, 'option_id': option_id, 'votes': n} for (at, option_id), n in sorted(votes.items())]
+
+
+def columnar(rows, option_ids):
+    """
+    Turn ``(at, option_id, votes)`` rows into parallel arrays. Only buckets
+    with votes are listed. With ``option_ids`` there is one series per
+    option, in that order, alongside the totals.
+    """
+    by_option = option_ids is not None
+    buckets, totals, series = [], [], [[] for _ in option_ids or ()]
+    position = {option_id: i for i, option_id in enumerate(option_ids or ())}
+    for row in rows:
+        if not buckets or buckets[-1] != row['at']:
+            buckets.append(row['at'])
+            totals.append(0)
+            for values in series:
+                values.append(0)
+        totals[-1] += row['votes']
+        if by_option:
+            series[position[row['option_id']]][-1] = row['votes']
+    data = {'buckets': [at.isoformat().replace('+00:00', 'Z') for at in buckets], 'votes': totals}
+    if by_option:
+        data['options'] = list(option_ids)
+        data['series'] = series
+    return data
+
+
+def get_timeline(poll_id, bucket, by_option=False):
+    """
+    Columnar timeline of a poll for one of BUCKETS, or None if the poll
+    does not exist. Cached until the poll changes.
+    """
+    variant = f"timeline:{bucket}:{'option' if by_option else 'total'}"
+    version, payload = poll_cache.get_cached(poll_id, variant)
+    if payload is not None:
+        return payload
+
+    status = Poll.objects.filter(pk=poll_id).values_list('status', flat=True).first()
+    if status is None:
+        return None
+    option_ids = None
+    if status == 'closed':
+        snapshot = PollResultSnapshot.objects.filter(poll_id=poll_id).values_list('timeline', flat=True).first()
+        if snapshot is None:
+            build_snapshots([poll_id])
+            snapshot = PollResultSnapshot.objects.get(poll_id=poll_id).timeline
+        if by_option:
+            option_ids = snapshot['options']
+        rows = snapshot_rows(snapshot, BUCKETS[bucket], by_option)
+    else:
+        if by_option:
+            option_ids = list(PollOption.objects.filter(poll_id=poll_id).order_by('id').values_list('id', flat=True))
+        rows = count_rows(poll_id, BUCKETS[bucket], by_option)
+    payload = {'poll': poll_id, 'bucket': bucket, **columnar(rows, option_ids)}
+    poll_cache.set_cached(poll_id, version, variant, payload)
+    return payload
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PollViewSet, PollOptionViewSet, VoteViewSet
+from . import async_views
+from .views import PollViewSet, PollOptionViewSet, VoteImportView, VoteViewSet
 
 # Create a router for polls
 polls_router = DefaultRouter()
@@ -9,6 +10,8 @@ polls_router.register(r'', PollViewSet, basename='poll')
 urlpatterns = [
     # Poll endpoints: /api/v1/polls/
     # path('', ApiRootView.as_view({'get': 'list'}), name='api-root'),
+    # Admin bulk import of offline ballots: /api/v1/polls/votes/import/
+    path('votes/import/', VoteImportView.as_view(), name='vote-import'),
     path("", include(polls_router.urls)),
 
     # Nested options: /api/v1/polls/<poll_id>/options/
@@ -42,4 +45,10 @@ urlpatterns = [
         }),
         name='poll-votes'
     ),
+
+    # Native async variants, for deployments served through kuranet.asgi
+    path('<int:pk>/async/', async_views.poll_detail, name='poll-detail-async'),
+    path('<int:poll_id>/votes/async/', async_views.vote_create, name='poll-votes-async'),
+    path('<int:poll_id>/results/async/', async_views.poll_results, name='poll-results-async'),
+    path('<int:poll_id>/results/stream/', async_views.poll_results_stream, name='poll-results-stream'),
 ]
@@ -1,11 +1,34 @@
+import logging
 import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.urls import reverse
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from .models import Poll, PollOption, Vote
-from users.models import User
-from .serializers import PollSerializer, PollOptionSerializer, VoteSerializer
-from .permissions import IsOwnerOrAdmin, IsCreator, IsPollOwnerOrAdmin, AllowAny
+from rest_framework.views import APIView
+from kuranet.logs import log_event
+from kuranet.pagination import PollCursorPagination, VoteCursorPagination
+from .models import Poll, PollOption, PollResultSnapshot, Vote
+from users.models import Role, User
+from users.authentication import resolve_user
+from .serializers import PollSerializer, PollSummarySerializer, PollOptionSerializer, VoteSerializer
+from .permissions import IsAdmin, IsOwnerOrAdmin, IsCreator, IsPollOwnerOrAdmin, AllowAny
+from .counters import PollClosed, apply_vote_deltas, cast_vote
+from .imports import import_votes
+from .results import get_results
+from .snapshots import build_snapshots
+from .timeline import BUCKETS, get_timeline
+from . import buffer
+from . import cache as poll_cache
+from .conditional import ConditionalGetMixin
+
+logger = logging.getLogger(__name__)
 
 
 # class ApiRootView(viewsets.ViewSet):
@@ -22,13 +45,132 @@ from .permissions import IsOwnerOrAdmin, IsCreator, IsPollOwnerOrAdmin, AllowAny
 #             'poll-options': f'{self.BASE_URL}api/v1/polls/{{poll_id}}/options/',
 #             'votes': f'{self.BASE_URL}api/v1/polls/{{poll_id}}/votes/'
 #         })
-class PollViewSet(viewsets.ModelViewSet):
+class PollViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Poll.objects.all()
     serializer_class = PollSerializer
+    pagination_class = PollCursorPagination
+    conditional_actions = ('retrieve', 'results', 'timeline')
+    conditional_poll_kwarg = 'pk'
+    results_batch_limit = 100
+    bulk_create_limit = 5000
+
+    @staticmethod
+    def get_poll_queryset(detail=True):
+        # Everything the serializer touches is loaded up front, so a page
+        # costs a fixed number of queries however many polls it holds.
+        queryset = (
+            Poll.objects
+            .select_related('user')
+            .prefetch_related(Prefetch('options', queryset=PollOption.objects.order_by('id')))
+            .order_by('-created_at', '-id')
+        )
+        if detail:
+            queryset = queryset.prefetch_related(
+                Prefetch('user__roles', queryset=Role.objects.order_by('id'))
+            )
+        return queryset
+
+    def get_queryset(self):
+        return self.get_poll_queryset(detail=self.action != 'list')
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return PollSummarySerializer
+        return PollSerializer
+
+    def get_expand(self):
+        expand = self.request.query_params.get('expand', '')
+        return {field.strip() for field in expand.split(',') if field.strip()}
+
+    def retrieve(self, request, *args, **kwargs):
+        expand = self.get_expand()
+        poll_id = self.get_cacheable_poll_id(expand)
+        if poll_id is not None:
+            version, body = poll_cache.get_cached(poll_id, 'detail')
+            if body is not None:
+                return HttpResponse(body, content_type='application/json')
+
+        poll = self.get_object()
+        data = self.get_serializer(poll).data
+        if 'votes' in expand:
+            data['votes'] = self.get_votes_page(poll)
+
+        if poll_id is not None:
+            body = request.accepted_renderer.render(data, renderer_context=self.get_renderer_context())
+            poll_cache.set_cached(poll_id, version, 'detail', body)
+            return HttpResponse(body, content_type='application/json')
+        return Response(data)
+
+    @action(detail=True)
+    def results(self, request, *args, **kwargs):
+        pk = self.kwargs[self.lookup_field]
+        results = get_results([int(pk)]).get(int(pk)) if pk.isdigit() else None
+        if results is None:
+            raise NotFound()
+        return Response(results)
+
+    @action(detail=True, url_path='results/timeline', url_name='results-timeline')
+    def timeline(self, request, *args, **kwargs):
+        """Votes per time bucket: ?bucket=1m|1h|1d|1w, and ?by=option for one series per option."""
+        bucket = request.query_params.get('bucket', '1h')
+        if bucket not in BUCKETS:
+            raise ValidationError({'bucket': f"Expected one of {', '.join(BUCKETS)}."})
+        by = request.query_params.get('by')
+        if by not in (None, 'option'):
+            raise ValidationError({'by': "Only 'option' is supported."})
+        pk = self.kwargs[self.lookup_field]
+        timeline = get_timeline(int(pk), bucket, by_option=by == 'option') if pk.isdigit() else None
+        if timeline is None:
+            raise NotFound()
+        return Response(timeline)
+
+    @action(detail=False, url_path='results', url_name='batch-results')
+    def batch_results(self, request, *args, **kwargs):
+        """Results for several polls at once: /polls/results/?ids=1,2,3"""
+        try:
+            ids = list(dict.fromkeys(
+                int(poll_id) for poll_id in request.query_params.get('ids', '').split(',') if poll_id.strip()
+            ))
+        except ValueError:
+            raise ValidationError({'ids': 'Expected a comma-separated list of poll ids.'})
+        if not ids:
+            raise ValidationError({'ids': 'This parameter is required.'})
+        if len(ids) > self.results_batch_limit:
+            raise ValidationError({'ids': f'At most {self.results_batch_limit} polls per request.'})
+
+        results = get_results(ids)
+        return Response({
+            'results': [results[poll_id] for poll_id in ids if poll_id in results],
+            'missing': [poll_id for poll_id in ids if poll_id not in results],
+        })
+
+    def get_cacheable_poll_id(self, expand):
+        """Poll id to cache this detail response under, or None to bypass the cache."""
+        if expand or self.request.accepted_renderer.format != 'json':
+            return None
+        pk = self.kwargs[self.lookup_field]
+        return int(pk) if pk.isdigit() and str(int(pk)) == pk else None
+
+    def get_votes_page(self, poll):
+        """
+        First page of the poll's votes, shaped like the paginated
+        /polls/<id>/votes/ response so clients can keep following `next`.
+        """
+        paginator = VoteCursorPagination()
+        votes = paginator.paginate_queryset(VoteViewSet.get_poll_votes(poll.id), self.request, view=self)
+        paginator.base_url = self.request.build_absolute_uri(
+            reverse('poll-votes', kwargs={'poll_id': poll.id})
+        )
+        return {
+            'count': poll.total_votes,
+            'next': paginator.get_next_link(),
+            'previous': None,
+            'results': VoteSerializer(votes, many=True, context=self.get_serializer_context()).data,
+        }
     
     def get_permissions(self):
 
-        if  self.action in ['list', 'retrieve']:
+        if  self.action in ['list', 'retrieve', 'results', 'batch_results', 'timeline']:
             permission_classes = [AllowAny]
         elif self.action in ['create']:
             # print(f"Creating a poll isAuthenticated ${IsAuthenticated}")
@@ -43,22 +185,46 @@ class PollViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         email = serializer.validated_data.get('user', {}).get('email', None)
         user_serializer = User.objects.filter(email=email).first() if email else None
-        user_serializer = user_serializer if user_serializer else self.request.user
+        user_serializer = user_serializer if user_serializer else resolve_user(self.request.user)
         # print(f"current user {user_serializer}")
         user = user_serializer if user_serializer else self.request.user
         # serializer.validated_data['user']
         # print(f"seralized data: {serializer.validated_data}")
         serializer.save(user=user)
 
-class PollOptionViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk-create')
+    def bulk(self, request, *args, **kwargs):
+        """Create a list of polls, all or nothing, with batched INSERTs."""
+        serializer = PollSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=self.bulk_create_limit,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        polls = serializer.save(user=resolve_user(request.user))
+        return Response(
+            {'created': len(polls), 'ids': [poll.pk for poll in polls]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        poll_cache.invalidate_polls(serializer.instance.pk)
+
+    def perform_destroy(self, instance):
+        poll_cache.invalidate_polls(instance.pk)
+        super().perform_destroy(instance)
+
+class PollOptionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = PollOptionSerializer
     permission_classes = [IsAuthenticated, IsPollOwnerOrAdmin]
+    # retrieve is left out: its object permission is only checked in get_object()
+    conditional_actions = ('list',)
     def get_queryset(self):
         # Get poll_id from URL parameters
         poll_id = self.kwargs['poll_id']
         
         # Base queryset: options from the specified poll
-        queryset = PollOption.objects.filter(poll_id=poll_id)
+        queryset = PollOption.objects.filter(poll_id=poll_id).order_by('id')
         
         # For detail actions (retrieve/update/delete), further filter by option ID
         if self.action in ['retrieve', 'update', 'partial_update', 'destroy']:
@@ -70,42 +236,119 @@ class PollOptionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         poll = Poll.objects.get(id=self.kwargs['poll_id'])
         serializer.save(poll=poll)
-    def partial_update(self, request, *args, **kwargs):
-        print(f"Partial update called with kwargs: {kwargs}")
-        return super().partial_update(request, *args, **kwargs)
-    def update(self, request, *args, **kwargs):
-        print(f"Update called with kwargs: {kwargs}")
-        return super().update(request, *args, **kwargs)
+        Poll.touch(poll.pk)
+        poll_cache.invalidate_polls(poll.pk)
 
     def perform_update(self, serializer):
-        print(f"Update called with kwargs: {self.kwargs}")
         poll = Poll.objects.get(id=self.kwargs['poll_id'])
         serializer.save(poll=poll)
-class VoteViewSet(viewsets.ModelViewSet):
+        Poll.touch(poll.pk)
+        poll_cache.invalidate_polls(poll.pk)
+        log_event(
+            logger, 'poll_option.updated',
+            poll_id=poll.pk, option_id=serializer.instance.pk,
+            user_id=self.request.user.pk, partial=serializer.partial,
+        )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # Locking the option waits out votes in flight, so the count is final
+            votes = PollOption.objects.select_for_update().values_list('vote_count', flat=True).get(pk=instance.pk)
+            super().perform_destroy(instance)
+            # The cascade removed the option's votes; take them off the poll too
+            apply_vote_deltas({}, {instance.poll_id: -votes})
+            Poll.touch(instance.poll_id)
+            if PollResultSnapshot.objects.filter(poll_id=instance.poll_id).exists():
+                build_snapshots([instance.poll_id])
+            poll_cache.invalidate_polls(instance.poll_id)
+
+class VoteViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = VoteSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = VoteCursorPagination
+    conditional_actions = ('list',)
     
+    @staticmethod
+    def get_poll_votes(poll_id):
+        return (
+            Vote.objects
+            .filter(poll_id=poll_id)
+            .select_related('user')
+            .prefetch_related(Prefetch('user__roles', queryset=Role.objects.order_by('id')))
+            .order_by('voted_at', 'id')
+        )
+
     def get_queryset(self):
-        return Vote.objects.filter(option__poll_id=self.kwargs['poll_id'])
+        return self.get_poll_votes(self.kwargs['poll_id'])
     
     def create(self, request, *args, **kwargs):
         poll_id = kwargs['poll_id']
         option_id = request.data.get('option_id')
         
+        if settings.VOTE_BUFFER_ENABLED:
+            return self.create_buffered(request, poll_id, option_id)
+
         try:
-            option = PollOption.objects.get(id=option_id, poll_id=poll_id)
-            
-            # Check for existing vote
-            if Vote.objects.filter(
-                user=request.user, 
-                option__poll_id=poll_id
-            ).exists():
-                return Response(
-                    {'error': 'You have already voted in this poll'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-                
-            Vote.objects.create(user=request.user, option=option)
+            cast_vote(request.user.pk, int(option_id), poll_id)
             return Response({'status': 'Vote recorded'}, status=status.HTTP_201_CREATED)
-        except PollOption.DoesNotExist:
+        except (TypeError, ValueError, PollOption.DoesNotExist):
+            return Response({'error': 'Invalid option'}, status=status.HTTP_400_BAD_REQUEST)
+        except PollClosed:
+            return Response({'error': 'This poll is closed'}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response(
+                {'error': 'You have already voted in this poll'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    def create_buffered(self, request, poll_id, option_id):
+        try:
+            option_id = int(option_id)
+        except (TypeError, ValueError):
+            return Response({'error': 'Invalid option'}, status=status.HTTP_400_BAD_REQUEST)
+
+        future = buffer.get_vote_buffer().submit(request.user.pk, option_id, int(poll_id))
+        try:
+            outcome = future.result(timeout=settings.VOTE_BUFFER_WAIT)
+        except FutureTimeoutError:
+            return Response({'status': 'Vote queued'}, status=status.HTTP_202_ACCEPTED)
+
+        if outcome == buffer.INVALID:
             return Response({'error': 'Invalid option'}, status=status.HTTP_400_BAD_REQUEST)
+        if outcome == buffer.CLOSED:
+            return Response({'error': 'This poll is closed'}, status=status.HTTP_400_BAD_REQUEST)
+        if outcome == buffer.DUPLICATE:
+            return Response(
+                {'error': 'You have already voted in this poll'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'status': 'Vote recorded'}, status=status.HTTP_201_CREATED)
+
+
+class VoteImportView(APIView):
+    """
+    Admin-only bulk import of offline ballots. The body is streamed as
+    NDJSON (application/x-ndjson) or CSV (text/csv) records of user_id,
+    option_id and an optional ISO 8601 voted_at.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    formats = {
+        'application/x-ndjson': 'ndjson',
+        'application/jsonl': 'ndjson',
+        'text/csv': 'csv',
+    }
+
+    def post(self, request, *args, **kwargs):
+        format = self.formats.get(request.content_type.split(';')[0].strip())
+        if format is None:
+            return Response(
+                {'error': f"Content-Type must be one of {', '.join(self.formats)}"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        # Read the raw body line by line instead of through request.data
+        lines = (line.decode('utf-8') for line in request._request)
+        try:
+            report = import_votes(lines, format=format)
+        except UnicodeDecodeError:
+            return Response({'error': 'The body must be UTF-8'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report.as_dict())
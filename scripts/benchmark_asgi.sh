@@ -0,0 +1,44 @@
+#!/bin/bash
+# Compares vote throughput of the WSGI (gunicorn) and ASGI (uvicorn) deployments.
+# Both servers run against the database configured for manage.py.
+#   WORKERS=4 VOTES=5000 CONCURRENCY=200 scripts/benchmark_asgi.sh
+set -e
+
+WORKERS=${WORKERS:-4}
+VOTES=${VOTES:-2000}
+CONCURRENCY=${CONCURRENCY:-100}
+PORT=${PORT:-8055}
+URL="http://127.0.0.1:${PORT}"
+
+python manage.py migrate --noinput > /dev/null
+
+wait_for_server() {
+    for _ in $(seq 1 50); do
+        curl -s -o /dev/null "${URL}/api/v1/polls/" && return 0
+        sleep 0.2
+    done
+    echo "Server did not start" >&2
+    return 1
+}
+
+run() {
+    local label=$1 endpoint=$2
+    shift 2
+    "$@" > /dev/null 2>&1 &
+    local server_pid=$!
+    trap "kill ${server_pid} 2>/dev/null" EXIT
+    wait_for_server
+    echo "== ${label}"
+    python manage.py benchmark_vote_load --url "${URL}" --endpoint "${endpoint}" \
+        --votes "${VOTES}" --concurrency "${CONCURRENCY}"
+    kill "${server_pid}"
+    wait "${server_pid}" 2>/dev/null || true
+    trap - EXIT
+}
+
+run "gunicorn WSGI, ${WORKERS} sync workers" sync \
+    gunicorn kuranet.wsgi:application --workers "${WORKERS}" --bind "127.0.0.1:${PORT}"
+run "uvicorn ASGI, ${WORKERS} workers, DRF viewset" sync \
+    uvicorn kuranet.asgi:application --workers "${WORKERS}" --port "${PORT}" --no-access-log
+run "uvicorn ASGI, ${WORKERS} workers, async view" async \
+    uvicorn kuranet.asgi:application --workers "${WORKERS}" --port "${PORT}" --no-access-log
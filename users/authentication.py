@@ -0,0 +1,133 @@
+# users/authentication.py
+import threading
+import time
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from .roles import set_role_names
+
+ROLES_CLAIM = 'roles'
+VERSION_CLAIM = 'ver'
+
+
+class RoleClaimJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that trusts the ``roles`` claim written by
+    RoleTokenObtainPairSerializer when ``JWT_ROLES_CLAIM`` is on, so
+    permission checks need no role query for the rest of the request.
+    """
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        roles = validated_token.get(ROLES_CLAIM)
+        if settings.JWT_ROLES_CLAIM and roles is not None:
+            set_role_names(user, roles)
+        return user
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight user built from access token claims.
+
+    id, username, is_staff and is_superuser come from the token; any other
+    attribute loads the full User row once and is read from it. Compares
+    equal to the User instance with the same primary key.
+    """
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def instance(self):
+        return User.objects.get(pk=self.id)
+
+    @cached_property
+    def username(self):
+        return self.token['username'] if 'username' in self.token else self.instance.username
+
+    @cached_property
+    def is_staff(self):
+        return self.token['is_staff'] if 'is_staff' in self.token else self.instance.is_staff
+
+    @cached_property
+    def is_superuser(self):
+        return self.token['is_superuser'] if 'is_superuser' in self.token else self.instance.is_superuser
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.instance, attr)
+
+    def __eq__(self, other):
+        if isinstance(other, (ClaimsUser, User)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+def resolve_user(user):
+    """Return a User model instance for ``user``, loading it if it is a ClaimsUser."""
+    return user.instance if isinstance(user, ClaimsUser) else user
+
+
+class RevocationCache:
+    """
+    In-process TTL cache of ``user_id -> (token_version, is_active)``.
+
+    Each process reads a user's revocation state at most once per TTL;
+    saving the user evicts the local entry straight away.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        state = User.objects.filter(pk=user_id).values_list('token_version', 'is_active').first()
+        with self._lock:
+            self._entries[user_id] = (now + self.ttl, state)
+        return state
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+revocations = RevocationCache(ttl=settings.JWT_REVOCATION_TTL)
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates from token claims alone and returns a ClaimsUser, so
+    the request does not load the User row. Deactivated users, and tokens
+    issued before the user's token_version was bumped, are rejected
+    within ``JWT_REVOCATION_TTL`` seconds.
+    """
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        state = revocations.get(user.id)
+        if state is None:
+            raise InvalidToken(_("User not found"))
+        token_version, is_active = state
+        if not is_active or validated_token.get(VERSION_CLAIM, 0) != token_version:
+            raise InvalidToken(_("Token has been revoked"))
+        roles = validated_token.get(ROLES_CLAIM)
+        if roles is not None:
+            set_role_names(user, roles)
+        return user
@@ -0,0 +1,47 @@
+# users/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import get_hasher, identify_hasher
+
+from . import hashing
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend whose password checks go through the bounded hashing
+    pool. Hashes made with outdated parameters are upgraded on a
+    successful login, so tuning PASSWORD_HASH_ITERATIONS takes effect
+    as users sign in.
+    """
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Spend the same hashing time as for an existing user, to keep
+            # the timing difference small
+            hashing.make_password(password, request=request)
+            return None
+
+        if not hashing.check_password(password, user.password, request=request):
+            return None
+        if self.must_rehash(user.password):
+            user.password = hashing.make_password(password, request=request)
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
+
+    def must_rehash(self, encoded):
+        # As in django.contrib.auth.hashers.check_password: the stock hasher
+        # shares the tuned hasher's algorithm name, so the preferred hasher
+        # decides whether the parameters are current
+        preferred = get_hasher('default')
+        try:
+            hasher = identify_hasher(encoded)
+        except ValueError:
+            return False
+        return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
@@ -0,0 +1,116 @@
+# users/hashing.py
+"""
+Bounded password hashing for the login and register paths.
+
+Hashes run in a dedicated process pool of ``PASSWORD_HASH_WORKERS``
+processes (inline when 0), so a burst of sign-ups or logins can only
+occupy that many CPUs. At most ``PASSWORD_HASH_QUEUE_DEPTH`` hashes may
+be running or waiting at once; past that, requests fail fast with 503
+instead of queueing behind each other and tying up web workers.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+logger = logging.getLogger(__name__)
+
+
+class HashingOverloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Authentication is temporarily overloaded, please retry shortly.'
+    default_code = 'hashing_overloaded'
+
+
+class HashStats:
+    """Process-wide hashing metrics."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.rejected = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+
+    def record(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def record_rejection(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'count': self.count,
+                'rejected': self.rejected,
+                'total_seconds': self.total_seconds,
+                'max_seconds': self.max_seconds,
+                'mean_seconds': self.total_seconds / self.count if self.count else 0.0,
+            }
+
+
+stats = HashStats()
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_QUEUE_DEPTH)
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def get_executor():
+    global _executor
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, initializer=_init_worker
+            )
+        return _executor
+
+
+def _run(func, *args, request=None):
+    if not _slots.acquire(blocking=False):
+        stats.record_rejection()
+        logger.warning("Password hashing queue full, shedding request")
+        raise HashingOverloaded()
+    started = time.perf_counter()
+    try:
+        executor = get_executor()
+        if executor is None:
+            return func(*args)
+        return executor.submit(func, *args).result()
+    finally:
+        _slots.release()
+        elapsed = time.perf_counter() - started
+        stats.record(elapsed)
+        if request is not None:
+            # On the HttpRequest the middleware sees, not DRF's Request wrapper
+            request = getattr(request, '_request', request)
+            request.password_hash_seconds = getattr(request, 'password_hash_seconds', 0.0) + elapsed
+        logger.info("password hash %s took %.1f ms", func.__name__, elapsed * 1000)
+
+
+def make_password(raw_password, request=None):
+    return _run(hashers.make_password, raw_password, request=request)
+
+
+def check_password(raw_password, encoded, request=None):
+    """Verify without the rehash side effect; see PooledModelBackend for upgrades."""
+    return _run(hashers.check_password, raw_password, encoded, request=request)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-17 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0004_alter_user_email"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="roles",
+            field=models.ManyToManyField(
+                blank=True, default="user", related_name="users", to="users.role"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"], name="user_date_joined_idx"
+            ),
+        ),
+    ]
@@ -8,11 +8,15 @@ from django.db import models
 
 
 class UserManager(BaseUserManager):
-    def create_user(self, username, password=None, **extra_fields):
+    def create_user(self, username, password=None, password_hash=None, **extra_fields):
         if not username:
             raise ValueError("The Username field is required")
         user = self.model(username=username, **extra_fields)
-        user.set_password(password)
+        if password_hash is not None:
+            # Already hashed, e.g. by users.hashing off the request thread
+            user.password = password_hash
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
@@ -42,6 +46,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     date_joined = models.DateTimeField(auto_now_add=True)
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
+    # Bumped to revoke every token issued so far (see users/authentication.py)
+    token_version = models.PositiveIntegerField(default=0)
 
     objects = UserManager()
     roles = models.ManyToManyField(Role, blank=True, related_name="users", default="user")
@@ -54,4 +60,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            # User listing order / cursor pagination
+            models.Index(fields=["date_joined", "id"], name="user_date_joined_idx"),
+        ]
 
@@ -0,0 +1,34 @@
+# users/roles.py
+"""
+Per-request role membership.
+
+Role names are resolved at most once per request: they are memoized on the
+user object, read from a ``roles`` JWT claim when one is present, or loaded
+with a single query. Nothing outlives the request, so a role change applies
+to the next request in every worker.
+"""
+ROLE_ATTR = '_role_names'
+
+
+def get_role_names(user):
+    """Return the frozenset of role names held by ``user``."""
+    if user is None or not user.is_authenticated:
+        return frozenset()
+    names = getattr(user, ROLE_ATTR, None)
+    if names is None:
+        prefetched = getattr(user, '_prefetched_objects_cache', {}).get('roles')
+        if prefetched is not None:
+            names = frozenset(role.name for role in prefetched)
+        else:
+            names = frozenset(user.roles.values_list('name', flat=True))
+        setattr(user, ROLE_ATTR, names)
+    return names
+
+
+def set_role_names(user, names):
+    """Prime the per-request memo, e.g. from a token claim."""
+    setattr(user, ROLE_ATTR, frozenset(names))
+
+
+def has_role(user, name):
+    return name in get_role_names(user)
@@ -1,5 +1,9 @@
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from .models import User, Role
+from .roles import get_role_names
+from . import hashing
 
 class RoleSerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,12 +25,35 @@ class UserSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(
             username=validated_data['username'],
             email=validated_data.get('email', ''),
-            password=validated_data['password'],
+            password_hash=hashing.make_password(
+                validated_data['password'], request=self.context.get('request')
+            ),
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', '')
         )
         return user
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username']
+
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
-    password = serializers.CharField(write_only=True)
\ No newline at end of file
+    password = serializers.CharField(write_only=True)
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Adds the claims StatelessJWTAuthentication builds its user from, plus
+    the user's role names when JWT_ROLES_CLAIM is on.
+    """
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.username
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token['ver'] = user.token_version
+        if settings.JWT_ROLES_CLAIM:
+            token['roles'] = sorted(get_role_names(user))
+        return token
@@ -0,0 +1,20 @@
+# users/signals.py
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .roles import ROLE_ATTR
+from .authentication import revocations
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def user_roles_changed(sender, instance, action, reverse, **kwargs):
+    # user.roles.add/remove/clear(...) on an instance that memoized its roles
+    if action.startswith('post_') and not reverse:
+        instance.__dict__.pop(ROLE_ATTR, None)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    # Deactivation or a token_version bump must not wait for the TTL here
+    revocations.evict(instance.pk)
@@ -1,5 +1,8 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from users.models import Role
+from users.roles import get_role_names, has_role
 
 User = get_user_model()
 
@@ -69,3 +72,36 @@ class TestUserModel:
                 email="user2@example.com",
                 password="password2"
             )
+
+
+@pytest.mark.django_db
+class TestRoleMembership:
+    @pytest.fixture
+    def user_with_role(self):
+        user = User.objects.create_user(username="roleuser", email="roleuser@example.com", password="pw")
+        user.roles.add(Role.objects.create(name="creator"))
+        return user
+
+    def test_role_names_resolved_once(self, user_with_role, django_assert_num_queries):
+        user = User.objects.get(pk=user_with_role.pk)
+        with django_assert_num_queries(1):
+            assert has_role(user, "creator")
+            assert not has_role(user, "admin")
+        # A fresh instance for the next request loads them again
+        with django_assert_num_queries(1):
+            assert has_role(User(pk=user.pk), "creator")
+
+    def test_adding_role_updates_memo(self, user_with_role):
+        assert not has_role(user_with_role, "admin")
+        user_with_role.roles.add(Role.objects.create(name="admin"))
+        assert has_role(user_with_role, "admin")
+        assert has_role(User.objects.get(pk=user_with_role.pk), "admin")
+
+    def test_reverse_membership_change_applies_to_next_request(self, user_with_role):
+        creator = Role.objects.get(name="creator")
+        assert has_role(User.objects.get(pk=user_with_role.pk), "creator")
+        creator.users.remove(user_with_role)
+        assert not has_role(User.objects.get(pk=user_with_role.pk), "creator")
+
+    def test_anonymous_user_has_no_roles(self):
+        assert get_role_names(AnonymousUser()) == frozenset()
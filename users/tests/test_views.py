@@ -1,5 +1,14 @@
+import re
+import threading
 import pytest
-from users.models import User
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.tokens import AccessToken
+from users.authentication import ClaimsUser, RoleClaimJWTAuthentication, StatelessJWTAuthentication
+from users.serializers import RoleTokenObtainPairSerializer
+from users import hashing
+from users.models import Role, User
+from users.roles import has_role
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -72,6 +81,17 @@ class TestUserViewSet:
         # assert any(user.get('username') == authenticated_client.handler._force_user.username for user in response.data)
         # assert any(user.get('username') == create_another_user.username for user in response.data)
 
+    def test_list_users_cursor_pagination(self, authenticated_client, create_another_user):
+        """Test that the user list pages with a cursor, newest first, without a total count."""
+        response = authenticated_client.get('/api/v1/users/', {'page_size': 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert 'count' not in response.data
+        assert response.data['results'][0]['username'] == create_another_user.username
+        assert 'cursor=' in response.data['next']
+
+        response = authenticated_client.get(response.data['next'])
+        assert response.data['results'][0]['username'] == authenticated_client.handler._force_user.username
+
     def test_list_users_unauthenticated(self, api_client):
         """Test listing users as an unauthenticated user (should fail)."""
         response = api_client.get('/api/v1/users/')
@@ -136,3 +156,133 @@ class TestUserViewSet:
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert not User.objects.filter(id=create_test_user.id).exists()
 
+
+
+@pytest.mark.django_db
+class TestRoleClaim:
+    @pytest.fixture
+    def creator(self):
+        user = User.objects.create_user(username="claim_user", email="claim@example.com", password="testpassword")
+        user.roles.add(Role.objects.create(name="creator"))
+        return user
+
+    def test_token_carries_roles_claim(self, api_client, creator, settings):
+        settings.JWT_ROLES_CLAIM = True
+        response = api_client.post('/api/v1/users/auth/login/', {'username': 'claim_user', 'password': 'testpassword'})
+        assert response.status_code == status.HTTP_200_OK
+        assert AccessToken(response.data['access'])['roles'] == ['creator']
+
+    def test_claim_primes_roles_without_query(self, creator, settings, django_assert_num_queries):
+        settings.JWT_ROLES_CLAIM = True
+        token = AccessToken.for_user(creator)
+        token['roles'] = ['creator']
+        user = RoleClaimJWTAuthentication().get_user(token)
+        with django_assert_num_queries(0):
+            assert has_role(user, 'creator')
+
+    def test_claim_ignored_when_disabled(self, creator, settings):
+        settings.JWT_ROLES_CLAIM = False
+        token = AccessToken.for_user(creator)
+        token['roles'] = ['admin']
+        user = RoleClaimJWTAuthentication().get_user(token)
+        assert not has_role(user, 'admin')
+
+
+@pytest.mark.django_db
+class TestStatelessAuthentication:
+    def authenticate(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def test_builds_user_from_claims(self, api_client, create_test_user, django_assert_num_queries):
+        response = api_client.post('/api/v1/users/auth/login/', {'username': 'view_user_test', 'password': 'testpassword'})
+        token = response.data['access']
+        self.authenticate(token)  # warm the revocation cache
+
+        with django_assert_num_queries(0):
+            user, _ = self.authenticate(token)
+            assert isinstance(user, ClaimsUser)
+            assert user.pk == create_test_user.pk
+            assert user.username == create_test_user.username
+            assert user == create_test_user
+            assert create_test_user == user
+
+        # Attributes outside the claims fall back to the database row
+        assert user.email == create_test_user.email
+
+    def test_deactivation_revokes_tokens(self, authenticated_admin_client, create_test_user):
+        token = str(RoleTokenObtainPairSerializer.get_token(create_test_user).access_token)
+        assert self.authenticate(token)[0].pk == create_test_user.pk
+
+        response = authenticated_admin_client.post(f'/api/v1/users/{create_test_user.pk}/deactivate/')
+        assert response.status_code == status.HTTP_200_OK
+        with pytest.raises(InvalidToken):
+            self.authenticate(token)
+
+    def test_token_version_bump_revokes_tokens(self, create_test_user):
+        token = str(RoleTokenObtainPairSerializer.get_token(create_test_user).access_token)
+        create_test_user.token_version += 1
+        create_test_user.save()
+        with pytest.raises(InvalidToken):
+            self.authenticate(token)
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    def test_login_upgrades_outdated_hash(self, api_client, settings):
+        settings.PASSWORD_HASH_ITERATIONS = 1000
+        user = User.objects.create_user(username="rehash_user", email="rehash@example.com", password="testpassword")
+        assert user.password.startswith("pbkdf2_sha256$1000$")
+
+        settings.PASSWORD_HASH_ITERATIONS = 2000
+        response = api_client.post('/api/v1/users/auth/login/', {'username': 'rehash_user', 'password': 'testpassword'})
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith("pbkdf2_sha256$2000$")
+        assert user.check_password("testpassword")
+
+    def test_login_keeps_current_hash(self, api_client, settings):
+        settings.PASSWORD_HASH_ITERATIONS = 1000
+        user = User.objects.create_user(username="current_hash", email="current@example.com", password="testpassword")
+        hashing.stats.reset()
+        for _ in range(2):
+            response = api_client.post('/api/v1/users/auth/login/', {'username': 'current_hash', 'password': 'testpassword'})
+            assert response.status_code == status.HTTP_200_OK
+        assert User.objects.get(pk=user.pk).password == user.password
+        # One check per login and no re-hash
+        assert hashing.stats.snapshot()['count'] == 2
+
+    def test_login_reports_hash_time_in_server_timing(self, api_client, create_test_user):
+        response = api_client.post('/api/v1/users/auth/login/', {'username': 'view_user_test', 'password': 'testpassword'})
+        assert response.status_code == status.HTTP_200_OK
+        assert re.search(r'(^|, )hash;dur=[\d.]+($|, )', response['Server-Timing'])
+
+    def test_login_wrong_password(self, api_client, create_test_user):
+        response = api_client.post('/api/v1/users/auth/login/', {'username': 'view_user_test', 'password': 'nope'})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_register_records_hash_time(self, api_client, settings):
+        settings.PASSWORD_HASH_ITERATIONS = 1000
+        hashing.stats.reset()
+        response = api_client.post('/api/v1/users/auth/register/', {
+            'username': 'hashed_signup', 'email': 'hashed_signup@example.com', 'password': 'testpassword'
+        })
+        assert response.status_code == status.HTTP_201_CREATED
+        assert User.objects.get(username='hashed_signup').check_password('testpassword')
+        assert hashing.stats.snapshot()['count'] == 1
+
+    def test_full_queue_sheds_load(self, api_client, create_test_user, monkeypatch):
+        monkeypatch.setattr(hashing, '_slots', threading.BoundedSemaphore(1))
+        hashing._slots.acquire()
+        response = api_client.post('/api/v1/users/auth/login/', {'username': 'view_user_test', 'password': 'testpassword'})
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_process_pool(self, settings, monkeypatch):
+        settings.PASSWORD_HASH_ITERATIONS = 1000
+        settings.PASSWORD_HASH_WORKERS = 1
+        monkeypatch.setattr(hashing, '_executor', None)
+        try:
+            encoded = hashing.make_password('pooled')
+            assert hashing.check_password('pooled', encoded)
+        finally:
+            hashing._executor.shutdown()
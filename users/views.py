@@ -1,16 +1,24 @@
+import logging
+
 from rest_framework import viewsets, status, permissions
 from users.permissions import IsOwnerOrAdmin, IsCreator, IsPollOwnerOrAdmin, AllowAny
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
+from django.db.models import F
 from .models import User
 from .serializers import UserSerializer
+from kuranet.logs import log_event
+from kuranet.pagination import UserCursorPagination
+
+logger = logging.getLogger(__name__)
 
 
 class UserViewSet(viewsets.ModelViewSet):
-    queryset = User.objects.all().order_by('-date_joined')
+    queryset = User.objects.all().order_by('-date_joined', '-id')
     serializer_class = UserSerializer
     permission_classes = []
+    pagination_class = UserCursorPagination
     
     def get_permissions(self):
         if self.action in ['retrieve']:
@@ -27,7 +35,9 @@ class UserViewSet(viewsets.ModelViewSet):
     def deactivate(self, request, pk=None):
         user = self.get_object()
         user.is_active = False
-        user.save()
+        # Revoke outstanding tokens for stateless authentication as well
+        user.token_version = F('token_version') + 1
+        user.save(update_fields=['is_active', 'token_version'])
         return Response({'status': 'user deactivated'}, status=status.HTTP_200_OK)
 
 class AuthViewSet(viewsets.ViewSet):
@@ -39,8 +49,8 @@ class AuthViewSet(viewsets.ViewSet):
     def register(self, request):
         serializer = UserSerializer(data=request.data)
         if serializer.is_valid():
-            print(serializer.validated_data)
             user = serializer.save()
+            log_event(logger, 'user.registered', user_id=user.pk)
             return Response(user.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     